@@ -0,0 +1,282 @@
+"""
+Load test for the runtime-config server contract.
+
+The script starts a local stand-in server that implements the get_settings/{service_name} endpoint (or uses the
+server passed with --server-url) and runs many RuntimeConfig clients against it in one or several processes. At the
+end it reports throughput, refresh latency percentiles, error rate and client memory.
+
+Examples:
+
+    python scripts/load_test.py --clients 2000 --processes 4 --duration 30 --rows 500 --latency 0.005
+    python scripts/load_test.py serve --port 8080 --rows 100 --error-rate 0.01
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import multiprocessing.queues
+import os
+import random
+import resource
+import sys
+import time
+import typing as t
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+from aiohttp import ClientSession, TCPConnector, web
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from runtime_config import RuntimeConfig  # noqa: E402
+from runtime_config.libs.asyncio_utils import LoopLagMonitor  # noqa: E402
+from runtime_config.sources import ConfigServerSrc  # noqa: E402
+from runtime_config.sources.base import BaseSource  # noqa: E402
+from runtime_config.tracing import CallbackTracer, Span  # noqa: E402
+
+SERVICE_NAME = 'load_test'
+
+SourceFactory = t.Callable[[str, ClientSession, t.Optional[Executor]], BaseSource]
+
+SOURCES: t.Dict[str, SourceFactory] = {
+    'config_server': lambda host, session, executor: ConfigServerSrc(
+        host=host, service_name=SERVICE_NAME, http_client=session, executor=executor
+    ),
+}
+
+
+@dataclass
+class ServerOptions:
+    rows: int
+    value_size: int
+    latency: float
+    latency_jitter: float
+    error_rate: float
+
+
+@dataclass
+class ClientReport:
+    refresh_latencies: t.List[float] = field(default_factory=list)
+    errors: int = 0
+    clients: int = 0
+    polling_clients: int = 0
+    rss_before: int = 0
+    rss_after: int = 0
+    max_loop_lag: float = 0
+    total_loop_lag: float = 0
+
+
+def build_payload(rows: int, value_size: int) -> bytes:
+    settings = [
+        {'name': f'setting_{index}', 'value': 'x' * value_size, 'value_type': 'str', 'disable': False}
+        for index in range(rows)
+    ]
+    return json.dumps(settings).encode()
+
+
+def create_server_app(options: ServerOptions) -> web.Application:
+    payload = build_payload(rows=options.rows, value_size=options.value_size)
+
+    async def get_settings(request: web.Request) -> web.Response:
+        delay = options.latency + random.uniform(0, options.latency_jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if random.random() < options.error_rate:
+            return web.Response(status=500, text='Injected error')
+        return web.Response(body=payload, content_type='application/json')
+
+    app = web.Application()
+    app.add_routes([web.get('/get_settings/{service_name}', get_settings)])
+    return app
+
+
+def run_server(host: str, port: int, options: ServerOptions) -> None:
+    web.run_app(create_server_app(options), host=host, port=port, print=None)
+
+
+def get_rss() -> int:
+    with open('/proc/self/statm') as statm:
+        return int(statm.read().split()[1]) * resource.getpagesize()
+
+
+async def run_clients(
+    server_url: str,
+    source_name: str,
+    clients: int,
+    duration: float,
+    refresh_interval: float,
+    merge_in_executor: bool,
+) -> ClientReport:
+    # Failed refreshes are counted in the report, there is no need to log each of them.
+    logging.getLogger('runtime_config').setLevel(logging.CRITICAL)
+    report = ClientReport(clients=clients, rss_before=get_rss())
+
+    def on_span_end(span: Span) -> None:
+        if span.name == 'runtime_config.refresh':
+            report.refresh_latencies.append(span.duration)
+        elif span.name == 'runtime_config.fetch' and span.error is not None:
+            report.errors += 1
+
+    tracer = CallbackTracer(on_span_end=on_span_end)
+    session = ClientSession(connector=TCPConnector(limit=0))
+    executor = ThreadPoolExecutor(max_workers=1) if merge_in_executor else None
+    loop_lag_monitor = LoopLagMonitor()
+    loop_lag_monitor.start()
+    instances = []
+    for _ in range(clients):
+        instances.append(
+            RuntimeConfig(
+                init_settings={},
+                source=SOURCES[source_name](server_url, session, executor),
+                refresh_interval=refresh_interval * random.uniform(0.9, 1.1),
+                # Clients are not created with RuntimeConfig.create, so injected errors must not stop their polling.
+                require_complete_init=False,
+                tracer=tracer,
+                merge_executor=executor,
+            )
+        )
+
+    await asyncio.sleep(duration)
+    report.rss_after = get_rss()
+    report.polling_clients = sum(not inst._periodic_refresh_task.done() for inst in instances)
+    await loop_lag_monitor.stop()
+    report.max_loop_lag = loop_lag_monitor.max_lag
+    report.total_loop_lag = loop_lag_monitor.total_lag
+
+    for inst in instances:
+        await inst.close()
+    await session.close()
+    if executor is not None:
+        executor.shutdown()
+    return report
+
+
+def client_process(
+    server_url: str,
+    source_name: str,
+    clients: int,
+    duration: float,
+    refresh_interval: float,
+    merge_in_executor: bool,
+    queue: multiprocessing.queues.Queue[ClientReport],
+) -> None:
+    report = asyncio.run(
+        run_clients(
+            server_url=server_url,
+            source_name=source_name,
+            clients=clients,
+            duration=duration,
+            refresh_interval=refresh_interval,
+            merge_in_executor=merge_in_executor,
+        )
+    )
+    queue.put(report)
+
+
+def percentile(values: t.List[float], percent: float) -> float:
+    if not values:
+        return float('nan')
+    ordered_values = sorted(values)
+    return ordered_values[min(len(ordered_values) - 1, int(len(ordered_values) * percent / 100))]
+
+
+def print_report(reports: t.List[ClientReport], duration: float) -> None:
+    latencies = [latency for report in reports for latency in report.refresh_latencies]
+    refreshes = len(latencies)
+    errors = sum(report.errors for report in reports)
+    clients = sum(report.clients for report in reports)
+    polling_clients = sum(report.polling_clients for report in reports)
+    memory = sum(report.rss_after - report.rss_before for report in reports)
+    max_loop_lag = max(report.max_loop_lag for report in reports)
+    loop_blocked = sum(report.total_loop_lag for report in reports) / len(reports) / duration
+
+    print(f'clients:             {clients} in {len(reports)} process(es), {polling_clients} still polling at the end')
+    print(f'refreshes:           {refreshes} ({refreshes / duration:.1f} per second)')
+    print(f'errors:              {errors} ({errors / max(refreshes, 1):.2%})')
+    print(f'refresh latency p50: {percentile(latencies, 50) * 1000:.2f} ms')
+    print(f'refresh latency p99: {percentile(latencies, 99) * 1000:.2f} ms')
+    print(f'max loop lag:        {max_loop_lag * 1000:.2f} ms')
+    print(f'loop blocked:        {loop_blocked:.2%} of the time (average over processes)')
+    print(f'client memory:       {memory / 2 ** 20:.1f} MiB ({memory / max(clients, 1) / 2 ** 10:.1f} KiB per client)')
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('mode', nargs='?', choices=['run', 'serve'], default='run')
+    parser.add_argument('--host', default='127.0.0.1', help='host of the stand-in server')
+    parser.add_argument('--port', type=int, default=8765, help='port of the stand-in server')
+    parser.add_argument('--rows', type=int, default=100, help='number of settings returned by the server')
+    parser.add_argument('--value-size', type=int, default=32, help='size of each setting value in bytes')
+    parser.add_argument('--latency', type=float, default=0, help='server response delay in seconds')
+    parser.add_argument('--latency-jitter', type=float, default=0, help='random extra delay in seconds')
+    parser.add_argument('--error-rate', type=float, default=0, help='share of responses with status 500')
+    parser.add_argument('--server-url', help='use the running server instead of the stand-in server')
+    parser.add_argument('--source', choices=sorted(SOURCES), default='config_server')
+    parser.add_argument('--clients', type=int, default=1000, help='total number of RuntimeConfig clients')
+    parser.add_argument('--processes', type=int, default=1, help='number of client processes')
+    parser.add_argument('--duration', type=float, default=30, help='test duration in seconds')
+    parser.add_argument('--refresh-interval', type=float, default=1, help='refresh interval of each client')
+    parser.add_argument(
+        '--merge-in-executor', action='store_true', help='decode and merge settings in a thread pool executor'
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    server_options = ServerOptions(
+        rows=args.rows,
+        value_size=args.value_size,
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        error_rate=args.error_rate,
+    )
+    if args.mode == 'serve':
+        run_server(host=args.host, port=args.port, options=server_options)
+        return
+
+    server = None
+    server_url = args.server_url
+    if server_url is None:
+        server = multiprocessing.Process(target=run_server, args=(args.host, args.port, server_options), daemon=True)
+        server.start()
+        server_url = f'http://{args.host}:{args.port}'
+        time.sleep(1)
+
+    queue: multiprocessing.queues.Queue[ClientReport] = multiprocessing.Queue()
+    clients_per_process = [args.clients // args.processes] * args.processes
+    clients_per_process[0] += args.clients % args.processes
+    processes = [
+        multiprocessing.Process(
+            target=client_process,
+            args=(
+                server_url,
+                args.source,
+                clients,
+                args.duration,
+                args.refresh_interval,
+                args.merge_in_executor,
+                queue,
+            ),
+        )
+        for clients in clients_per_process
+    ]
+    for process in processes:
+        process.start()
+    reports = [queue.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    if server is not None:
+        server.terminate()
+
+    print_report(reports=reports, duration=args.duration)
+    if sum(report.polling_clients for report in reports) != sum(report.clients for report in reports):
+        sys.exit('Some clients stopped polling, the results are not reliable.')
+
+
+if __name__ == '__main__':
+    main()
@@ -1 +1,32 @@
-from .runtime_config import RuntimeConfig, get_instance  # noqa: F401
+from __future__ import annotations
+
+# typing is not imported at runtime to keep the package import cheap.
+TYPE_CHECKING = False
+if TYPE_CHECKING:  # pragma: no cover
+    import typing as t
+
+    from .runtime_config import RuntimeConfig, get_instance  # noqa: F401
+
+__all__ = ['RuntimeConfig', 'get_instance']
+
+
+def __getattr__(name: str) -> t.Any:
+    # The package is imported lazily (PEP 562), so that importing it does not pull asyncio, aiohttp and pydantic
+    # until they are really needed.
+    if name in __all__:
+        from . import runtime_config
+
+        value = getattr(runtime_config, name)
+        globals()[name] = value
+        return value
+    if name == 'sources':
+        import importlib
+
+        module = importlib.import_module(f'{__name__}.sources')
+        globals()[name] = module
+        return module
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__() -> t.List[str]:
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import array
+import bisect
+import typing as t
+
+
+class IntSet:
+    """
+    Immutable set of integers stored in a compact sorted buffer of 64-bit integers. It is used for large sets of
+    identifiers where a set of Python ints would allocate an object for every element. Membership is checked with
+    binary search.
+    """
+
+    __slots__ = ('_items',)
+
+    def __init__(self, items: t.Iterable[int] = ()) -> None:
+        self._items: array.array[int] = array.array('q', sorted(set(items)))
+
+    @classmethod
+    def from_sorted_unique(cls, items: array.array[int]) -> IntSet:
+        """
+        Creates a set from a buffer that is already sorted and has no duplicates, without copying it.
+        """
+        inst = cls.__new__(cls)
+        inst._items = items
+        return inst
+
+    @property
+    def items(self) -> array.array[int]:
+        """
+        Sorted buffer with the elements of the set. It supports the buffer protocol, so it can be wrapped into
+        memoryview or numpy.frombuffer without copying.
+        """
+        return self._items
+
+    def __contains__(self, item: object) -> bool:
+        if not isinstance(item, int):
+            return False
+        index = bisect.bisect_left(self._items, item)
+        return index < len(self._items) and self._items[index] == item
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> t.Iterator[int]:
+        return iter(self._items)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, IntSet):
+            return self._items == other._items
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self._items.tobytes())
+
+    def __copy__(self) -> IntSet:
+        return self
+
+    def __deepcopy__(self, memo: t.Dict[int, t.Any]) -> IntSet:
+        return self
+
+    def __repr__(self) -> str:
+        return f'IntSet({self._items.tolist()!r})'
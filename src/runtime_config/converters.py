@@ -1,8 +1,16 @@
+from __future__ import annotations
+
+import array
+import importlib
 import json
 import typing as t
+import warnings
 
+from runtime_config.containers import IntSet
 from runtime_config.enums.setting_value_type import SettingValueType
 
+_numpy: t.Any = None
+
 
 def convert_bool(value: str) -> bool:
     if value in ('true', 'True', '1'):
@@ -12,10 +20,93 @@ def convert_bool(value: str) -> bool:
     raise ValueError('Received value could not be converted to a bool')
 
 
+def convert_int_array(value: str) -> array.array[int]:
+    return _parse_numbers(value=value, typecode='q')
+
+
+def convert_float_array(value: str) -> array.array[float]:
+    return _parse_numbers(value=value, typecode='d')
+
+
+def convert_int_set(value: str) -> IntSet:
+    text = _strip_brackets(value)
+    numpy = _import_numpy()
+    if numpy is not None:
+        items = array.array('q', numpy.unique(_parse_with_numpy(numpy=numpy, text=text, typecode='q')).tobytes())
+    else:
+        items = array.array('q', sorted(set(_parse_with_python(text=text, typecode='q'))))
+    return IntSet.from_sorted_unique(items)
+
+
+def _parse_numbers(value: str, typecode: str) -> array.array[t.Any]:
+    """
+    Parses comma separated numbers (the value can also be a JSON array) into a contiguous buffer. If numpy is
+    installed, the numbers are parsed without creating an intermediate Python object for each of them.
+    """
+    text = _strip_brackets(value)
+    numpy = _import_numpy()
+    if numpy is not None:
+        return array.array(typecode, _parse_with_numpy(numpy=numpy, text=text, typecode=typecode).tobytes())
+    return array.array(typecode, _parse_with_python(text=text, typecode=typecode))
+
+
+def _strip_brackets(value: str) -> str:
+    text = value.strip()
+    if text.startswith('[') and text.endswith(']'):
+        text = text[1:-1]
+    return text
+
+
+def _parse_with_python(text: str, typecode: str) -> t.Iterable[t.Any]:
+    if not text.strip():
+        return []
+    return map(int if typecode == 'q' else float, text.split(','))
+
+
+def _parse_with_numpy(numpy: t.Any, text: str, typecode: str) -> t.Any:
+    dtype = numpy.int64 if typecode == 'q' else numpy.float64
+    if not text.strip():
+        return numpy.empty(0, dtype=dtype)
+    with warnings.catch_warnings():
+        # Older versions of numpy only warn if the string could not be parsed to its end.
+        warnings.simplefilter('error', DeprecationWarning)
+        try:
+            parsed = numpy.fromstring(text, dtype=dtype, sep=',')
+        except DeprecationWarning as exc:
+            raise ValueError(str(exc))
+    if len(parsed) != text.count(',') + 1:
+        raise ValueError('Received value could not be converted to an array of numbers')
+    if typecode == 'q':
+        _check_int64_overflow(numpy=numpy, text=text, parsed=parsed)
+    return parsed
+
+
+def _check_int64_overflow(numpy: t.Any, text: str, parsed: t.Any) -> None:
+    # numpy clamps out-of-range integers to the limits of int64, so values at the limits are checked with Python ints.
+    limits = numpy.iinfo(numpy.int64)
+    tokens = text.split(',')
+    for index in numpy.flatnonzero((parsed == limits.max) | (parsed == limits.min)):
+        if int(tokens[index]) != parsed[index]:
+            raise OverflowError('Received value is out of the range of a signed 64-bit integer')
+
+
+def _import_numpy() -> t.Any:
+    global _numpy
+    if _numpy is None:
+        try:
+            _numpy = importlib.import_module('numpy')
+        except ImportError:
+            _numpy = False
+    return _numpy or None
+
+
 converters_map: t.Dict[SettingValueType, t.Callable[[t.Any], t.Any]] = {
     SettingValueType.str: lambda value: value,
     SettingValueType.int: int,
     SettingValueType.bool: convert_bool,
     SettingValueType.null: lambda value: None,
     SettingValueType.json: json.loads,
+    SettingValueType.int_array: convert_int_array,
+    SettingValueType.float_array: convert_float_array,
+    SettingValueType.int_set: convert_int_set,
 }
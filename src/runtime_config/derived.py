@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import typing as t
+from dataclasses import dataclass
+from logging import getLogger
+
+from runtime_config.libs.settings_path import MISSING, get_by_path, set_by_path
+
+logger = getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DerivedSetting:
+    """
+    Setting whose value is computed from other settings. The values of the settings listed in depends_on are passed
+    to func as positional arguments. Dependencies can be regular settings or other derived settings.
+    """
+
+    func: t.Callable[..., t.Any]
+    depends_on: t.Sequence[str]
+
+
+class DerivedSettingsGraph:
+    """
+    Dependency graph of derived settings. After each merge of settings, only derived settings whose inputs have
+    changed are recomputed, the rest reuse the value computed earlier.
+    """
+
+    def __init__(self, derived_settings: t.Mapping[str, DerivedSetting]) -> None:
+        self._derived_settings = dict(derived_settings)
+        self._order = self._sort(self._derived_settings)
+        self._inputs: t.Dict[str, t.Tuple[t.Any, ...]] = {}
+        self._values: t.Dict[str, t.Any] = {}
+
+    @property
+    def names(self) -> t.List[str]:
+        return list(self._order)
+
+    def apply(self, settings: t.Dict[str, t.Any]) -> t.List[str]:
+        """
+        Inserts derived settings into settings.
+        :return: names of derived settings that have been recomputed.
+        """
+        recomputed = []
+        for name in self._order:
+            derived_setting = self._derived_settings[name]
+            inputs = tuple(
+                get_by_path(settings, dependency, default=MISSING) for dependency in derived_setting.depends_on
+            )
+            if any(value is MISSING for value in inputs):
+                logger.warning('Derived setting depends on a missing setting. name=%s', name)
+                continue
+
+            previous_inputs = self._inputs.get(name)
+            if previous_inputs is None or not _is_same_inputs(previous_inputs, inputs):
+                try:
+                    self._values[name] = derived_setting.func(*inputs)
+                except Exception:
+                    logger.warning('Failed to compute derived setting. name=%s', name, exc_info=True)
+                    if name not in self._values:
+                        continue
+                else:
+                    self._inputs[name] = inputs
+                    recomputed.append(name)
+
+            set_by_path(settings, name, self._values[name])
+        return recomputed
+
+    @staticmethod
+    def _sort(derived_settings: t.Dict[str, DerivedSetting]) -> t.List[str]:
+        order: t.List[str] = []
+        visited: t.Set[str] = set()
+        in_progress: t.List[str] = []
+
+        def visit(name: str) -> None:
+            if name in visited:
+                return
+            if name in in_progress:
+                cycle = ' -> '.join(in_progress[in_progress.index(name) :] + [name])
+                raise ValueError(f'Derived settings have a circular dependency: {cycle}')
+            in_progress.append(name)
+            for dependency in derived_settings[name].depends_on:
+                if dependency in derived_settings:
+                    visit(dependency)
+            in_progress.pop()
+            visited.add(name)
+            order.append(name)
+
+        for name in derived_settings:
+            visit(name)
+        return order
+
+
+def _is_same_inputs(previous_inputs: t.Tuple[t.Any, ...], inputs: t.Tuple[t.Any, ...]) -> bool:
+    for previous_value, value in zip(previous_inputs, inputs):
+        if previous_value is value:
+            continue
+        try:
+            if previous_value != value:
+                return False
+        except Exception:
+            return False
+    return True
@@ -7,3 +7,6 @@ class SettingValueType(enum.Enum):
     bool = 'bool'
     null = 'null'
     json = 'json'
+    int_array = 'int_array'
+    float_array = 'float_array'
+    int_set = 'int_set'
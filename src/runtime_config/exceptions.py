@@ -8,3 +8,11 @@ class InitializationError(RuntimeConfigBaseException):
 
 class ValidationError(RuntimeConfigBaseException):
     pass
+
+
+class CircuitOpenError(RuntimeConfigBaseException):
+    pass
+
+
+class SourceError(RuntimeConfigBaseException):
+    pass
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import collections
+import typing as t
+from dataclasses import dataclass
+
+from runtime_config.libs.settings_path import MISSING, PATH_SEPARATOR
+
+if t.TYPE_CHECKING:  # pragma: no cover
+    from runtime_config.entities.runtime_setting_server import Setting
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """
+    Settings applied by RuntimeConfig together with the settings received from the source, from which they were
+    merged.
+    """
+
+    version: int
+    settings: t.Dict[str, t.Any]
+    raw_settings: t.List[Setting]
+
+
+class SnapshotHistory:
+    """
+    Bounded history of snapshots ordered by version. When the history is full, the oldest snapshot is dropped.
+    Snapshots are stored by reference, so unchanged values shared by consecutive snapshots (see the intern_values
+    option of RuntimeConfig) are stored once.
+    """
+
+    def __init__(self, size: int) -> None:
+        if size < 1:
+            raise ValueError('History size must be at least 1.')
+        self._size = size
+        self._snapshots: t.OrderedDict[int, Snapshot] = collections.OrderedDict()
+
+    @property
+    def versions(self) -> t.List[int]:
+        return list(self._snapshots)
+
+    @property
+    def latest(self) -> Snapshot:
+        return next(reversed(self._snapshots.values()))
+
+    def add(self, snapshot: Snapshot) -> None:
+        self._snapshots[snapshot.version] = snapshot
+        while len(self._snapshots) > self._size:
+            self._snapshots.popitem(last=False)
+
+    def get(self, version: int) -> Snapshot:
+        """
+        :raise KeyError: if the snapshot of the version is not in the history.
+        """
+        try:
+            return self._snapshots[version]
+        except KeyError:
+            raise KeyError(f'Snapshot of version {version} is not in the history. Versions: {self.versions}')
+
+
+def diff_settings(
+    old_settings: t.Dict[str, t.Any], new_settings: t.Dict[str, t.Any]
+) -> t.Dict[str, t.Tuple[t.Any, t.Any]]:
+    """
+    Compares two sets of settings.
+    :return: old and new values of changed settings by their names in the "key__inner_key" notation. Nested
+    dictionaries are compared key by key. If a setting is missing on one side, MISSING is returned as its value.
+    """
+    diff: t.Dict[str, t.Tuple[t.Any, t.Any]] = {}
+    stack: t.List[t.Tuple[str, t.Dict[str, t.Any], t.Dict[str, t.Any]]] = [('', old_settings, new_settings)]
+    while stack:
+        prefix, old_dict, new_dict = stack.pop()
+        for key in list(old_dict) + [key for key in new_dict if key not in old_dict]:
+            old_value = old_dict.get(key, MISSING)
+            new_value = new_dict.get(key, MISSING)
+            if old_value is new_value:
+                continue
+            name = f'{prefix}{PATH_SEPARATOR}{key}' if prefix else key
+            if isinstance(old_value, dict) and isinstance(new_value, dict):
+                stack.append((name, old_value, new_value))
+            elif old_value is MISSING or new_value is MISSING or not _is_equal(old_value, new_value):
+                diff[name] = (old_value, new_value)
+    return dict(sorted(diff.items()))
+
+
+def _is_equal(old_value: t.Any, new_value: t.Any) -> bool:
+    if type(old_value) is not type(new_value):
+        return False
+    try:
+        return bool(old_value == new_value)
+    except Exception:
+        return False
@@ -1,5 +1,13 @@
+from __future__ import annotations
+
 import asyncio
+import contextvars
+import time
 import typing as t
+from concurrent.futures import Executor, ProcessPoolExecutor
+from types import TracebackType
+
+T = t.TypeVar('T')
 
 
 def periodic_task(
@@ -11,3 +19,67 @@ def periodic_task(
             await func()
 
     return asyncio.create_task(wrapper())
+
+
+def check_thread_executor(executor: t.Optional[Executor]) -> None:
+    # Functions passed to the executor use objects of the current process (caches, tracers), so they can not be
+    # sent to other processes.
+    if isinstance(executor, ProcessPoolExecutor):
+        raise ValueError('Process pool executors are not supported, use a thread pool executor.')
+
+
+async def run_in_executor(executor: t.Optional[Executor], func: t.Callable[..., T], *args: t.Any) -> T:
+    """
+    Runs the function in the executor (in the default executor of the loop if executor is None). Unlike
+    loop.run_in_executor, the function is run in a copy of the current context, so spans started in it are linked to
+    the current span.
+    """
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(executor, context.run, func, *args)
+
+
+class LoopLagMonitor:
+    """
+    Measures how long the event loop is blocked. A background task sleeps for `interval` seconds, and the time by
+    which it wakes up later than expected is the time during which the loop was busy and could not run other
+    coroutines.
+    """
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self._interval = interval
+        self._task: t.Optional[asyncio.Task[None]] = None
+        self.max_lag: float = 0
+        self.total_lag: float = 0
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def reset(self) -> None:
+        self.max_lag = 0
+        self.total_lag = 0
+
+    async def _run(self) -> None:
+        while True:
+            expected_at = time.perf_counter() + self._interval
+            await asyncio.sleep(self._interval)
+            lag = max(0.0, time.perf_counter() - expected_at)
+            self.max_lag = max(self.max_lag, lag)
+            self.total_lag += lag
+
+    async def __aenter__(self) -> LoopLagMonitor:
+        self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: t.Optional[t.Type[BaseException]],
+        exc_val: t.Optional[BaseException],
+        exc_tb: t.Optional[TracebackType],
+    ) -> None:
+        await self.stop()
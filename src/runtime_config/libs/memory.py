@@ -0,0 +1,123 @@
+import sys
+import typing as t
+
+from runtime_config.libs.settings_path import MISSING
+
+
+def deep_sizeof(obj: t.Any, seen: t.Optional[t.Set[int]] = None) -> int:
+    """
+    Returns the size of the object together with all objects reachable from it through containers, instance
+    dictionaries and slots. Objects whose ids are in seen are not counted, and the ids of counted objects are added
+    to it, so a shared seen set allows counting objects shared between several values only once.
+    """
+    if seen is None:
+        seen = set()
+
+    size = 0
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        size += sys.getsizeof(current)
+
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        elif not isinstance(current, (str, bytes, int, float, type)):
+            if hasattr(current, '__dict__'):
+                stack.append(current.__dict__)
+            for slot in getattr(type(current), '__slots__', ()):
+                value = getattr(current, slot, MISSING)
+                if value is not MISSING:
+                    stack.append(value)
+    return size
+
+
+class ValueInterner:
+    """
+    Deduplicates values of settings. Strings are interned, equal immutable values (tuples, frozensets, bytes and
+    other hashable objects) are replaced by one instance, and subtrees equal to the subtree at the same place in the
+    previous settings are replaced by the previous subtree. As a result, settings that have not changed since the
+    previous refresh do not allocate new objects, and the memory used by settings stays flat over time.
+    """
+
+    def __init__(self) -> None:
+        self._immutable_values: t.Dict[t.Any, t.Any] = {}
+
+    def intern(self, value: t.Any, previous_value: t.Any = MISSING) -> t.Any:
+        immutable_values: t.Dict[t.Any, t.Any] = {}
+        result = self._intern(value=value, previous_value=previous_value, immutable_values=immutable_values)
+        # Only values used by the current settings are kept, so that outdated values can be garbage collected.
+        self._immutable_values = immutable_values
+        return result
+
+    def _intern(self, value: t.Any, previous_value: t.Any, immutable_values: t.Dict[t.Any, t.Any]) -> t.Any:
+        if type(value) is str:
+            return sys.intern(value)
+
+        if isinstance(value, (bool, int, float)) or value is None:
+            return previous_value if _is_equal(value, previous_value) else value
+
+        if type(value) is dict:
+            previous_dict = previous_value if type(previous_value) is dict else {}
+            value = {
+                self._intern(key, MISSING, immutable_values): self._intern(
+                    item, previous_dict.get(key, MISSING), immutable_values
+                )
+                for key, item in value.items()
+            }
+            # Children equal to the previous ones have been replaced by them, so comparing identities is enough.
+            if len(value) == len(previous_dict) and all(
+                previous_dict.get(key, MISSING) is item for key, item in value.items()
+            ):
+                return previous_value
+            return value
+
+        if type(value) is list:
+            previous_list = previous_value if type(previous_value) is list else []
+            value = [
+                self._intern(item, previous_list[index] if index < len(previous_list) else MISSING, immutable_values)
+                for index, item in enumerate(value)
+            ]
+            if len(value) == len(previous_list) and all(
+                item is previous_item for item, previous_item in zip(value, previous_list)
+            ):
+                return previous_value
+            return value
+
+        return self._intern_immutable(value=value, previous_value=previous_value, immutable_values=immutable_values)
+
+    def _intern_immutable(self, value: t.Any, previous_value: t.Any, immutable_values: t.Dict[t.Any, t.Any]) -> t.Any:
+        try:
+            key = _get_exact_key(value)
+            hash(key)
+        except TypeError:
+            return previous_value if _is_equal(value, previous_value) else value
+
+        if key in immutable_values:
+            return immutable_values[key]
+        interned_value = self._immutable_values.get(key, value)
+        immutable_values[key] = interned_value
+        return interned_value
+
+
+def _get_exact_key(value: t.Any) -> t.Any:
+    # Values of different types can be equal (1 == 1.0 == True), so types are a part of the key.
+    if isinstance(value, tuple):
+        return type(value), tuple(_get_exact_key(item) for item in value)
+    if isinstance(value, frozenset):
+        return type(value), frozenset(_get_exact_key(item) for item in value)
+    return type(value), value
+
+
+def _is_equal(value: t.Any, previous_value: t.Any) -> bool:
+    if previous_value is MISSING or type(value) is not type(previous_value):
+        return False
+    try:
+        return bool(value == previous_value)
+    except Exception:
+        return False
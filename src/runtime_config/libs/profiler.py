@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import collections
+import sys
+import threading
+import typing as t
+from types import FrameType, TracebackType
+
+
+class SamplingProfiler:
+    """
+    Simple sampling profiler. A background thread periodically takes the stack of the profiled thread and counts
+    how many times each stack was seen. The result uses the collapsed stack format ("outer;inner" -> number of
+    samples), which is understood by flame graph tools.
+    """
+
+    def __init__(self, interval: float = 0.001, thread_id: t.Optional[int] = None) -> None:
+        self._interval = interval
+        self._thread_id = thread_id
+        self._stop_event = threading.Event()
+        self._sampler: t.Optional[threading.Thread] = None
+        self.stacks: t.Counter[str] = collections.Counter()
+
+    def start(self) -> None:
+        if self._thread_id is None:
+            self._thread_id = threading.get_ident()
+        self._stop_event.clear()
+        self._sampler = threading.Thread(target=self._run, name='runtime-config-profiler', daemon=True)
+        self._sampler.start()
+
+    def stop(self) -> t.Dict[str, int]:
+        self._stop_event.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+        return dict(self.stacks)
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self._interval):
+            frame = sys._current_frames().get(self._thread_id)  # type: ignore[arg-type]
+            if frame is not None:
+                self.stacks[_collapse_stack(frame)] += 1
+
+    def __enter__(self) -> SamplingProfiler:
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: t.Optional[t.Type[BaseException]],
+        exc_val: t.Optional[BaseException],
+        exc_tb: t.Optional[TracebackType],
+    ) -> None:
+        self.stop()
+
+
+def _collapse_stack(frame: t.Optional[FrameType]) -> str:
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f'{code.co_name} ({code.co_filename}:{code.co_firstlineno})')
+        frame = frame.f_back
+    return ';'.join(reversed(stack))
@@ -0,0 +1,54 @@
+import typing as t
+
+PATH_SEPARATOR = '__'
+
+# Can be passed as the default value to distinguish a missing setting from a setting with the value None.
+MISSING: t.Any = object()
+
+_RAISE_ERROR: t.Any = object()
+
+
+def get_by_path(settings: t.Dict[str, t.Any], setting_name: str, default: t.Any = _RAISE_ERROR) -> t.Any:
+    """
+    Returns the value of the setting by its name in the "key__inner_key" notation. If the setting does not exist,
+    returns the default value or raises KeyError if the default value is not passed.
+    """
+    value: t.Any = settings
+    for key in setting_name.split(PATH_SEPARATOR):
+        if not isinstance(value, dict) or key not in value:
+            if default is _RAISE_ERROR:
+                raise KeyError(setting_name)
+            return default
+        value = value[key]
+    return value
+
+
+def set_by_path(settings: t.Dict[str, t.Any], setting_name: str, value: t.Any) -> None:
+    """
+    Sets the value of the setting by its name in the "key__inner_key" notation. Missing intermediate dictionaries are
+    created.
+    """
+    *path, last_key = setting_name.split(PATH_SEPARATOR)
+    inner_dict = settings
+    for key in path:
+        inner_dict = inner_dict.setdefault(key, {})
+    inner_dict[last_key] = value
+
+
+class PrefixFilter:
+    """
+    Checks whether a setting belongs to one of the subtrees defined by prefixes in the "key__inner_key" notation. A
+    setting matches a prefix if it is the prefix itself, is inside the subtree of the prefix or contains the whole
+    subtree of the prefix (for example, the setting "db" for the prefix "db__connection").
+    """
+
+    def __init__(self, prefixes: t.Iterable[str]) -> None:
+        self.prefixes = tuple(prefixes)
+        self._exact_names = set(self.prefixes)
+        for prefix in self.prefixes:
+            path = prefix.split(PATH_SEPARATOR)
+            self._exact_names.update(PATH_SEPARATOR.join(path[:index]) for index in range(1, len(path)))
+        self._subtree_prefixes = tuple(f'{prefix}{PATH_SEPARATOR}' for prefix in self.prefixes)
+
+    def __call__(self, setting_name: str) -> bool:
+        return setting_name in self._exact_names or setting_name.startswith(self._subtree_prefixes)
@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import asyncio
+import collections
+import contextlib
+import enum
+import time
+import typing as t
+from types import TracebackType
+
+from runtime_config.exceptions import CircuitOpenError
+
+if t.TYPE_CHECKING:  # pragma: no cover
+    from runtime_config.runtime_config import RuntimeConfig
+
+
+class TokenBucket:
+    """
+    Asynchronous token bucket rate limiter. Tokens are added at the rate of `rate` tokens per second up to `capacity`
+    tokens. The rate and the capacity can be changed in place, waiting tasks take the new values into account
+    immediately.
+    """
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self._rate = float(rate)
+        self._capacity = float(capacity)
+        self._tokens = self._capacity
+        self._updated_at = time.monotonic()
+        self._waiters: t.Set[asyncio.Future[None]] = set()
+
+    @classmethod
+    def from_settings(cls, config: RuntimeConfig, rate: str, capacity: str) -> TokenBucket:
+        """
+        Creates a rate limiter whose rate and capacity are taken from the settings and are updated when a refresh
+        changes them.
+        :param config: RuntimeConfig instance.
+        :param rate: name of the setting with the rate in the "key__inner_key" notation.
+        :param capacity: name of the setting with the capacity in the "key__inner_key" notation.
+        """
+        bucket = cls(rate=config.get_setting(rate), capacity=config.get_setting(capacity))
+        config.subscribe(rate, bucket.set_rate)
+        config.subscribe(capacity, bucket.set_capacity)
+        return bucket
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    @property
+    def capacity(self) -> float:
+        return self._capacity
+
+    def set_rate(self, rate: float) -> None:
+        self._refill()
+        self._rate = float(rate)
+        self._wake_up_waiters()
+
+    def set_capacity(self, capacity: float) -> None:
+        self._refill()
+        self._capacity = float(capacity)
+        self._tokens = min(self._tokens, self._capacity)
+        self._wake_up_waiters()
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        self._refill()
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            return True
+        return False
+
+    async def acquire(self, tokens: float = 1) -> None:
+        """
+        Waits until the requested number of tokens is available and takes them. If the rate is not positive or the
+        number of tokens is greater than the capacity, waits until the limiter is reconfigured.
+        """
+        loop = asyncio.get_running_loop()
+        while not self.try_acquire(tokens):
+            if self._rate > 0 and tokens <= self._capacity:
+                timeout: t.Optional[float] = (tokens - self._tokens) / self._rate
+            else:
+                timeout = None
+            waiter = loop.create_future()
+            self._waiters.add(waiter)
+            try:
+                await asyncio.wait([waiter], timeout=timeout)
+            finally:
+                self._waiters.discard(waiter)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        if self._rate > 0:
+            self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+        self._updated_at = now
+
+    def _wake_up_waiters(self) -> None:
+        for waiter in self._waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    async def __aenter__(self) -> TokenBucket:
+        await self.acquire()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: t.Optional[t.Type[BaseException]],
+        exc_val: t.Optional[BaseException],
+        exc_tb: t.Optional[TracebackType],
+    ) -> None:
+        pass
+
+
+class ResizableSemaphore:
+    """
+    Asynchronous semaphore whose limit can be changed in place. If the limit is decreased, tasks that have already
+    acquired the semaphore keep working, and new tasks wait until the number of acquired slots falls below the new
+    limit.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self._limit = limit
+        self._in_use = 0
+        self._waiters: t.Deque[asyncio.Future[None]] = collections.deque()
+
+    @classmethod
+    def from_settings(cls, config: RuntimeConfig, limit: str) -> ResizableSemaphore:
+        """
+        Creates a semaphore whose limit is taken from the setting and is updated when a refresh changes it.
+        :param config: RuntimeConfig instance.
+        :param limit: name of the setting with the limit in the "key__inner_key" notation.
+        """
+        semaphore = cls(limit=config.get_setting(limit))
+        config.subscribe(limit, semaphore.set_limit)
+        return semaphore
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @property
+    def in_use(self) -> int:
+        return self._in_use
+
+    def set_limit(self, limit: int) -> None:
+        self._limit = int(limit)
+        self._wake_up_waiters()
+
+    def locked(self) -> bool:
+        return self._in_use >= self._limit
+
+    async def acquire(self) -> None:
+        if not self._waiters and self._in_use < self._limit:
+            self._in_use += 1
+            return
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was given to the task right before the cancellation.
+                self.release()
+            else:
+                # The cancelled waiter could have been dropped from the queue by release before the task resumed.
+                with contextlib.suppress(ValueError):
+                    self._waiters.remove(waiter)
+            raise
+
+    def release(self) -> None:
+        self._in_use -= 1
+        self._wake_up_waiters()
+
+    def _wake_up_waiters(self) -> None:
+        while self._waiters and self._in_use < self._limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_use += 1
+                waiter.set_result(None)
+
+    async def __aenter__(self) -> ResizableSemaphore:
+        await self.acquire()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: t.Optional[t.Type[BaseException]],
+        exc_val: t.Optional[BaseException],
+        exc_tb: t.Optional[TracebackType],
+    ) -> None:
+        self.release()
+
+
+class CircuitState(enum.Enum):
+    closed = 'closed'
+    open = 'open'
+    half_open = 'half_open'
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker. After `failure_threshold` consecutive failures, the circuit opens and calls are rejected with
+    CircuitOpenError. After `recovery_timeout` seconds, one trial call is allowed; if it succeeds, the circuit closes.
+    """
+
+    def __init__(self, failure_threshold: int, recovery_timeout: float) -> None:
+        self._failure_threshold = failure_threshold
+        self._recovery_timeout = recovery_timeout
+        self._state = CircuitState.closed
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_progress = False
+
+    @classmethod
+    def from_settings(cls, config: RuntimeConfig, failure_threshold: str, recovery_timeout: str) -> CircuitBreaker:
+        """
+        Creates a circuit breaker whose parameters are taken from the settings and are updated when a refresh changes
+        them.
+        :param config: RuntimeConfig instance.
+        :param failure_threshold: name of the setting with the failure threshold in the "key__inner_key" notation.
+        :param recovery_timeout: name of the setting with the recovery timeout in the "key__inner_key" notation.
+        """
+        breaker = cls(
+            failure_threshold=config.get_setting(failure_threshold),
+            recovery_timeout=config.get_setting(recovery_timeout),
+        )
+        config.subscribe(failure_threshold, breaker.set_failure_threshold)
+        config.subscribe(recovery_timeout, breaker.set_recovery_timeout)
+        return breaker
+
+    @property
+    def state(self) -> CircuitState:
+        if self._state is CircuitState.open and time.monotonic() - self._opened_at >= self._recovery_timeout:
+            return CircuitState.half_open
+        return self._state
+
+    def set_failure_threshold(self, failure_threshold: int) -> None:
+        self._failure_threshold = int(failure_threshold)
+
+    def set_recovery_timeout(self, recovery_timeout: float) -> None:
+        self._recovery_timeout = float(recovery_timeout)
+
+    def allow_request(self) -> bool:
+        state = self.state
+        if state is CircuitState.closed:
+            return True
+        if state is CircuitState.half_open and not self._trial_in_progress:
+            self._state = CircuitState.half_open
+            self._trial_in_progress = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self._state = CircuitState.closed
+        self._failures = 0
+        self._trial_in_progress = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._state is CircuitState.half_open or self._failures >= self._failure_threshold:
+            self._state = CircuitState.open
+            self._opened_at = time.monotonic()
+        self._trial_in_progress = False
+
+    async def __aenter__(self) -> CircuitBreaker:
+        if not self.allow_request():
+            raise CircuitOpenError('Circuit is open, the call is rejected.')
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: t.Optional[t.Type[BaseException]],
+        exc_val: t.Optional[BaseException],
+        exc_tb: t.Optional[TracebackType],
+    ) -> None:
+        if exc_type is None:
+            self.record_success()
+        elif issubclass(exc_type, Exception):
+            self.record_failure()
+        else:
+            # The call was interrupted (for example, cancelled), so its result is unknown.
+            self._trial_in_progress = False
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import typing as t
+from dataclasses import dataclass
+
+from runtime_config.libs.settings_path import PrefixFilter
+
+if t.TYPE_CHECKING:  # pragma: no cover
+    from runtime_config.entities.runtime_setting_server import Setting
+
+
+@dataclass(frozen=True)
+class RefreshTier:
+    interval: float
+    prefix_filter: PrefixFilter
+
+    @property
+    def prefixes(self) -> t.Tuple[str, ...]:
+        return self.prefix_filter.prefixes
+
+
+class RefreshTiers:
+    """
+    Keeps the latest settings received for each refresh tier. Settings of a tier are refreshed with their own
+    interval; settings that do not belong to any tier are refreshed with the main interval together with all other
+    settings. A setting that matches prefixes of several tiers belongs to the tier with the smallest interval.
+
+    Each update carries the sequence number of the refresh that fetched the settings, and settings of a tier are
+    replaced only by settings fetched later, so a slow refresh can not override newer settings.
+    """
+
+    def __init__(self, tiers: t.Optional[t.Mapping[str, float]] = None) -> None:
+        prefixes_by_interval: t.Dict[float, t.List[str]] = {}
+        for prefix, interval in (tiers or {}).items():
+            prefixes_by_interval.setdefault(interval, []).append(prefix)
+        self.tiers = [
+            RefreshTier(interval=interval, prefix_filter=PrefixFilter(prefixes))
+            for interval, prefixes in sorted(prefixes_by_interval.items())
+        ]
+        # Settings and sequence numbers of each tier. The key None is used for settings outside of the tiers.
+        self._rows: t.Dict[t.Optional[int], t.List[Setting]] = {}
+        self._sequences: t.Dict[t.Optional[int], int] = {}
+
+    @property
+    def sequence(self) -> int:
+        return max(self._sequences.values(), default=0)
+
+    def update(self, rows: t.List[Setting], sequence: int, tier: t.Optional[int] = None) -> None:
+        """
+        Saves settings fetched by the refresh. If tier is None, the rows contain all settings and are distributed
+        over all tiers, otherwise they contain settings of the given tier.
+        """
+        rows_by_tier: t.Dict[t.Optional[int], t.List[Setting]]
+        if tier is None:
+            rows_by_tier = {None: []}
+            rows_by_tier.update({index: [] for index in range(len(self.tiers))})
+        else:
+            rows_by_tier = {tier: []}
+
+        if not self.tiers:
+            rows_by_tier[None] = rows
+        else:
+            for row in rows:
+                row_tier = self._get_tier(row.name)
+                if row_tier in rows_by_tier:
+                    rows_by_tier[row_tier].append(row)
+
+        for key, tier_rows in rows_by_tier.items():
+            if sequence > self._sequences.get(key, 0):
+                self._rows[key] = tier_rows
+                self._sequences[key] = sequence
+
+    def rows(self) -> t.List[Setting]:
+        if len(self._rows) == 1:
+            return next(iter(self._rows.values()))
+        return [row for tier_rows in self._rows.values() for row in tier_rows]
+
+    def _get_tier(self, setting_name: str) -> t.Optional[int]:
+        for index, tier in enumerate(self.tiers):
+            if tier.prefix_filter(setting_name):
+                return index
+        return None
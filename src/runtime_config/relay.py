@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import typing as t
+from types import TracebackType
+
+try:
+    from aiohttp import web
+except ImportError:  # pragma: no cover
+    raise ImportError(
+        'Missing dependencies for SettingsRelay support. Please reinstall the library with '
+        'extras "aiohttp". Example: pip install "runtime-config-py[aiohttp]"'
+    )
+
+from runtime_config.libs.settings_path import PrefixFilter
+
+if t.TYPE_CHECKING:  # pragma: no cover
+    from runtime_config.entities.runtime_setting_server import Setting
+    from runtime_config.runtime_config import RuntimeConfig
+
+
+@dataclasses.dataclass(frozen=True)
+class _SerializedSettings:
+    body: bytes
+    etag: str
+
+
+class SettingsRelay:
+    """
+    Serves the current settings of RuntimeConfig to other processes of the same host over the
+    get_settings/{service_name} contract of the runtime-config server. Processes point their ConfigServerSrc to the
+    relay instead of the server, so the load on the server depends on the number of hosts, not processes.
+
+    Settings are serialized once per version of RuntimeConfig (and per set of prefixes requested by clients).
+    Responses carry an ETag, and a request with a matching If-None-Match header gets an empty 304 response. Until
+    RuntimeConfig receives settings from the source, requests get 503.
+    """
+
+    def __init__(self, config: RuntimeConfig, service_name: t.Optional[str] = None) -> None:
+        """
+        :param config: RuntimeConfig instance whose settings are served.
+        :param service_name: if passed, requests for other services get 404, otherwise any service name is accepted.
+        """
+        self._config = config
+        self._service_name = service_name
+        self._version: t.Optional[int] = None
+        self._serialized_settings: t.Dict[t.Tuple[str, ...], _SerializedSettings] = {}
+        self._runner: t.Optional[web.AppRunner] = None
+
+    def add_routes(self, app: web.Application) -> None:
+        """
+        Mounts the get_settings/{service_name} handler to an existing application.
+        """
+        app.router.add_get('/get_settings/{service_name}', self.get_settings)
+
+    def create_app(self) -> web.Application:
+        app = web.Application()
+        self.add_routes(app)
+        return app
+
+    async def start(self, host: str = '127.0.0.1', port: t.Optional[int] = None, path: t.Optional[str] = None) -> None:
+        """
+        Starts a standalone server that listens on the TCP port or on the unix socket.
+        :param host: host of the TCP server.
+        :param port: port of the TCP server.
+        :param path: path of the unix socket. Clients connect to it with aiohttp.UnixConnector.
+        """
+        if (port is None) == (path is None):
+            raise ValueError('Pass either port or path of the unix socket.')
+
+        runner = web.AppRunner(self.create_app(), access_log=None)
+        await runner.setup()
+        site: web.BaseSite
+        if path is not None:
+            site = web.UnixSite(runner, path)
+        else:
+            site = web.TCPSite(runner, host, port)
+        try:
+            await site.start()
+        except Exception:
+            await runner.cleanup()
+            raise
+        self._runner = runner
+
+    async def get_settings(self, request: web.Request) -> web.Response:
+        if self._service_name is not None and request.match_info['service_name'] != self._service_name:
+            return web.Response(status=404, text='Unknown service name')
+        if self._config.version == 0:
+            # Settings have not been received from the source yet. Clients should keep their last settings instead of
+            # replacing them with an empty list.
+            return web.Response(status=503, text='Settings have not been received from the source yet')
+
+        serialized_settings = self._get_serialized_settings(prefixes=tuple(request.query.getall('prefix', [])))
+        headers = {'ETag': serialized_settings.etag}
+        if _etag_matches(request.headers.get('If-None-Match'), serialized_settings.etag):
+            return web.Response(status=304, headers=headers)
+        return web.Response(body=serialized_settings.body, content_type='application/json', headers=headers)
+
+    def _get_serialized_settings(self, prefixes: t.Tuple[str, ...]) -> _SerializedSettings:
+        if self._version != self._config.version:
+            self._serialized_settings = {}
+            self._version = self._config.version
+
+        serialized_settings = self._serialized_settings.get(prefixes)
+        if serialized_settings is None:
+            rows = self._config.raw_settings
+            if prefixes:
+                prefix_filter = PrefixFilter(prefixes)
+                rows = [row for row in rows if prefix_filter(row.name)]
+            body = json.dumps([_serialize_setting(row) for row in rows]).encode()
+            etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+            serialized_settings = self._serialized_settings[prefixes] = _SerializedSettings(body=body, etag=etag)
+        return serialized_settings
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> SettingsRelay:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: t.Optional[t.Type[BaseException]],
+        exc_val: t.Optional[BaseException],
+        exc_tb: t.Optional[TracebackType],
+    ) -> None:
+        await self.close()
+
+
+def _serialize_setting(setting: Setting) -> t.Dict[str, t.Any]:
+    return {
+        'name': setting.name,
+        'value': setting.value,
+        'value_type': setting.value_type.value,
+        'disable': setting.disable,
+    }
+
+
+def _etag_matches(if_none_match: t.Optional[str], etag: str) -> bool:
+    if if_none_match is None:
+        return False
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == '*' or candidate == etag:
+            return True
+    return False
@@ -2,17 +2,40 @@ from __future__ import annotations
 
 import asyncio
 import copy
+import functools
 import os
+import threading
 import typing as t
+from concurrent.futures import Executor
 from logging import getLogger
 from types import TracebackType
 
 from runtime_config import sources
 from runtime_config.converters import converters_map
-from runtime_config.entities.runtime_setting_server import Setting
+from runtime_config.derived import DerivedSetting, DerivedSettingsGraph
+from runtime_config.enums.setting_value_type import SettingValueType
 from runtime_config.exceptions import InitializationError, ValidationError
-from runtime_config.libs.asyncio_utils import periodic_task
-from runtime_config.sources.config_server import BaseSource
+from runtime_config.history import Snapshot, SnapshotHistory, diff_settings
+from runtime_config.libs.asyncio_utils import (
+    check_thread_executor,
+    periodic_task,
+    run_in_executor,
+)
+from runtime_config.libs.memory import ValueInterner, deep_sizeof
+from runtime_config.libs.profiler import SamplingProfiler
+from runtime_config.libs.settings_path import (
+    MISSING,
+    PATH_SEPARATOR,
+    PrefixFilter,
+    get_by_path,
+)
+from runtime_config.refresh_tiers import RefreshTiers
+from runtime_config.schema import SettingsSchema
+from runtime_config.sources.base import BaseSource
+from runtime_config.tracing import NOOP_TRACER, BaseTracer
+
+if t.TYPE_CHECKING:  # pragma: no cover
+    from runtime_config.entities.runtime_setting_server import Setting
 
 logger = getLogger(__name__)
 
@@ -28,13 +51,62 @@ class RuntimeConfig:
         source: BaseSource,
         refresh_interval: float,
         require_complete_init: bool = True,
+        schema: SettingsSchema | None = None,
+        tracer: BaseTracer | None = None,
+        refresh_debounce: float = 0.1,
+        derived_settings: t.Mapping[str, DerivedSetting] | None = None,
+        prefixes: t.Iterable[str] | None = None,
+        refresh_tiers: t.Mapping[str, float] | None = None,
+        intern_values: bool = False,
+        history_size: int = 10,
+        merge_executor: Executor | None = None,
+        merge_chunk_size: int | None = None,
     ) -> None:
         self._init_settings: SettingsType = copy.deepcopy(init_settings)
         self._settings: SettingsType = copy.deepcopy(init_settings)
+        self._raw_settings: t.List[Setting] = []
+        self._derived_settings = DerivedSettingsGraph(derived_settings) if derived_settings else None
+        if self._derived_settings is not None:
+            self._derived_settings.apply(self._settings)
         self._initialized = False
-
+        self._version = 0
+        # The history contains the last applied snapshots including the current one. While a snapshot is pinned,
+        # settings received from the source are added to the history, but are not applied.
+        self._history = SnapshotHistory(size=history_size)
+        self._history.add(Snapshot(version=self._version, settings=self._settings, raw_settings=self._raw_settings))
+        self._pinned_snapshot: Snapshot | None = None
+        # Sequence number of the last started refresh and of the refresh whose result is currently applied. The
+        # result of a refresh is applied only if it is newer than the applied one.
+        self._refresh_sequence = 0
+        self._applied_sequence = 0
+        self._refresh_tiers = RefreshTiers(refresh_tiers)
+        self._merge_lock = asyncio.Lock()
+        self._refresh_task: asyncio.Task[None] | None = None
+        self._tier_refresh_tasks: t.Dict[int, asyncio.Task[None]] = {}
+        self._refresh_request: asyncio.Task[None] | None = None
+        self._requested_refresh_tasks: t.Set[asyncio.Task[None]] = set()
+        self._closed = False
+        self._refresh_debounce = refresh_debounce
+        self._subscribers: t.Dict[str, t.List[t.Callable[[t.Any], None]]] = {}
+
+        self._tracer = tracer or NOOP_TRACER
         self._source = source
-        self._settings_merger = SettingsMerger(init_settings=init_settings)
+        if tracer is not None:
+            self._source.tracer = tracer
+        self._settings_merger = SettingsMerger(
+            init_settings=init_settings,
+            schema=schema,
+            tracer=self._tracer,
+            derived_settings=self._derived_settings,
+            prefixes=prefixes,
+            intern_values=intern_values,
+            executor=merge_executor,
+            chunk_size=merge_chunk_size,
+        )
+        self._periodic_tier_refresh_tasks: t.List[asyncio.Task[None]] = [
+            periodic_task(functools.partial(self._refresh_tier, index), callback_time=tier.interval)
+            for index, tier in enumerate(self._refresh_tiers.tiers)
+        ]
         self._periodic_refresh_task: asyncio.Task[None] = periodic_task(self.refresh, callback_time=refresh_interval)
         self._require_complete_init = require_complete_init
 
@@ -44,6 +116,16 @@ class RuntimeConfig:
         source: BaseSource | None = None,
         refresh_interval: float = 10,
         require_complete_init: bool = True,
+        schema: SettingsSchema | None = None,
+        tracer: BaseTracer | None = None,
+        refresh_debounce: float = 0.1,
+        derived_settings: t.Mapping[str, DerivedSetting] | None = None,
+        prefixes: t.Iterable[str] | None = None,
+        refresh_tiers: t.Mapping[str, float] | None = None,
+        intern_values: bool = False,
+        history_size: int = 10,
+        merge_executor: Executor | None = None,
+        merge_chunk_size: int | None = None,
     ) -> RuntimeConfig:
         """
         Creates and initializes an instance of the class. You should always use this method to instantiate a class.
@@ -52,6 +134,27 @@ class RuntimeConfig:
         :param refresh_interval: the frequency with which updates will be requested from the source.
         :param require_complete_init: if set to true, exceptions that occur during the first time settings are
         received from an external source will not be caught
+        :param schema: typed description of settings. Values received from the source that do not match the schema
+        are skipped. Use SettingsSchema.from_init_settings to infer the schema from init_settings or
+        SettingsSchema.from_model to build it from a pydantic model.
+        :param tracer: hook that receives spans with timings of fetching, decoding and merging settings.
+        :param refresh_debounce: delay in seconds during which refreshes requested with request_refresh are coalesced
+        into one refresh.
+        :param derived_settings: settings computed from other settings. They are recomputed after a refresh only if
+        the settings they depend on have changed.
+        :param prefixes: prefixes of the settings in the "key__inner_key" notation that are used by the process. Other
+        settings received from the source are skipped before conversion. The automatically created source also sends
+        the prefixes to the server, a source passed manually should be configured with the same prefixes.
+        :param refresh_tiers: refresh intervals for subtrees of settings, for example {'kill_switches': 0.5}. Settings
+        from these subtrees are additionally fetched with their own interval, all settings are still fetched with
+        refresh_interval. The results are merged into one set of settings.
+        :param intern_values: if set to true, repeated strings and equal immutable values are deduplicated, and
+        values that have not changed since the previous refresh reuse the objects of the previous settings.
+        :param history_size: number of the last versions of settings that are kept for pin, rollback and diff.
+        :param merge_executor: thread pool executor in which received settings are converted and merged, so that a
+        large merge does not block the event loop. The merged settings are applied in the event loop.
+        :param merge_chunk_size: if merge_executor is not passed, the merge gives control back to the event loop
+        after each chunk of this number of settings.
         :return: initialized class instance.
         """
         if 'inst' in _instance:
@@ -65,48 +168,285 @@ class RuntimeConfig:
                     'Define RUNTIME_CONFIG_HOST and RUNTIME_CONFIG_SERVICE_NAME environment variables or initialize '
                     'source manually and pass it to create method.'
                 )
-            source = sources.ConfigServerSrc(host=host, service_name=service_name)
+            source = sources.ConfigServerSrc(host=host, service_name=service_name, prefixes=prefixes)
 
         inst = RuntimeConfig(
             init_settings=init_settings,
             source=source,
             refresh_interval=refresh_interval,
             require_complete_init=require_complete_init,
+            schema=schema,
+            tracer=tracer,
+            refresh_debounce=refresh_debounce,
+            derived_settings=derived_settings,
+            prefixes=prefixes,
+            refresh_tiers=refresh_tiers,
+            intern_values=intern_values,
+            history_size=history_size,
+            merge_executor=merge_executor,
+            merge_chunk_size=merge_chunk_size,
         )
         _instance['inst'] = inst
         await inst.refresh()
         inst._initialized = True
         return inst
 
+    @property
+    def version(self) -> int:
+        """
+        Version of the current settings. Each time changed settings are received from the source, they get the next
+        version. While settings are pinned, it is the version of the pinned settings.
+        """
+        return self._version
+
+    @property
+    def history(self) -> t.List[int]:
+        """
+        Versions of settings kept in the history, from the oldest to the newest.
+        """
+        return self._history.versions
+
+    @property
+    def pinned_version(self) -> int | None:
+        return None if self._pinned_snapshot is None else self._pinned_snapshot.version
+
+    def pin(self, version: int) -> None:
+        """
+        Applies settings of the version from the history and keeps them until unpin is called. Settings received from
+        the source in the meantime are added to the history, but are not applied.
+        :raise KeyError: if the version is not in the history.
+        """
+        snapshot = self._history.get(version)
+        self._pinned_snapshot = snapshot
+        self._switch_to(snapshot)
+        logger.warning('Settings are pinned. version=%s', version)
+
+    def rollback(self, steps: int = 1) -> int:
+        """
+        Pins settings of the version that was applied `steps` versions before the current one.
+        :return: the pinned version.
+        :raise ValueError: if the history does not contain that many versions before the current one.
+        """
+        versions = self._history.versions
+        index = versions.index(self._version) - steps if self._version in versions else -1
+        if steps < 1 or index < 0:
+            raise ValueError(f'History does not contain {steps} versions before version {self._version}.')
+        self.pin(versions[index])
+        return versions[index]
+
+    def unpin(self) -> None:
+        """
+        Releases the pinned settings and applies the latest settings received from the source.
+        """
+        if self._pinned_snapshot is None:
+            return
+        self._pinned_snapshot = None
+        self._switch_to(self._history.latest)
+        logger.warning('Settings are unpinned. version=%s', self._version)
+
+    def diff(self, old_version: int, new_version: int) -> t.Dict[str, t.Tuple[t.Any, t.Any]]:
+        """
+        Compares settings of two versions from the history.
+        :return: old and new values of changed settings by their names in the "key__inner_key" notation. If a
+        setting is missing in one of the versions, MISSING is returned as its value.
+        :raise KeyError: if one of the versions is not in the history.
+        """
+        return diff_settings(self._history.get(old_version).settings, self._history.get(new_version).settings)
+
+    @property
+    def raw_settings(self) -> t.List[Setting]:
+        """
+        Settings received from the source, from which the current settings were merged. They are empty until the
+        first successful refresh.
+        """
+        return self._raw_settings
+
     async def refresh(self) -> None:
+        """
+        Fetches settings from the source and applies them. If a refresh is already running, the call waits for it
+        instead of starting another one.
+        """
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh())
+        await asyncio.shield(self._refresh_task)
+
+    def request_refresh(self) -> None:
+        """
+        Schedules a refresh without waiting for it. Requests received during the debounce delay are coalesced into one
+        refresh. If a refresh is running when the delay expires, another refresh is started after it, because the
+        running one could have fetched settings before the request was received.
+        """
+        if self._closed:
+            return
+        if self._refresh_request is None or self._refresh_request.done():
+            self._refresh_request = asyncio.create_task(self._run_requested_refresh())
+            # The task stops being the current request after the debounce delay, but close still has to cancel it.
+            self._requested_refresh_tasks.add(self._refresh_request)
+            self._refresh_request.add_done_callback(self._requested_refresh_tasks.discard)
+
+    async def _run_requested_refresh(self) -> None:
+        await asyncio.sleep(self._refresh_debounce)
+        self._refresh_request = None
+
+        running_refresh = self._refresh_task
+        if running_refresh is not None and not running_refresh.done():
+            await asyncio.wait([running_refresh])
+        try:
+            await self.refresh()
+        except Exception:
+            # The error has already been logged by refresh.
+            pass
+
+    async def _refresh_tier(self, tier: int) -> None:
+        task = self._tier_refresh_tasks.get(tier)
+        if task is None or task.done():
+            task = self._tier_refresh_tasks[tier] = asyncio.create_task(self._refresh(tier=tier))
+        await asyncio.shield(task)
+
+    async def _refresh(self, tier: int | None = None) -> None:
         def _check_inst_initialization(inst: RuntimeConfig, exception: Exception) -> None:
-            if not inst._initialized and inst._require_complete_init:
+            # Tier refreshes run in periodic tasks that are already running during the initialization, and an
+            # exception would stop them. The initialization is checked by the full refresh of the create method.
+            if tier is None and not inst._initialized and inst._require_complete_init:
                 raise exception
 
-        extracted_settings = None
-        try:
-            extracted_settings = await self._source.get_settings()
-        except ValidationError as exc:
-            logger.error("Fetched not valid data from remote source", exc_info=True)
-            _check_inst_initialization(self, exc)
-        except Exception as exc:
-            logger.error('Fetching new settings from a remote source failed', exc_info=True)
-            _check_inst_initialization(self, exc)
-
-        if extracted_settings is not None:
+        self._refresh_sequence += 1
+        sequence = self._refresh_sequence
+
+        with self._tracer.start_span('runtime_config.refresh', None if tier is None else {'tier': tier}):
+            extracted_settings = None
             try:
-                self._settings = await self._settings_merger.merge(extracted_settings=extracted_settings)
+                with self._tracer.start_span('runtime_config.fetch') as span:
+                    if tier is None:
+                        extracted_settings = await self._source.get_settings()
+                    else:
+                        extracted_settings = await self._source.get_settings_by_prefixes(
+                            prefixes=self._refresh_tiers.tiers[tier].prefixes
+                        )
+                    span.set_attribute('rows', len(extracted_settings))
+            except ValidationError as exc:
+                logger.error("Fetched not valid data from remote source", exc_info=True)
+                _check_inst_initialization(self, exc)
             except Exception as exc:
-                logger.error('Merge settings error', exc_info=True)
+                logger.error('Fetching new settings from a remote source failed', exc_info=True)
                 _check_inst_initialization(self, exc)
 
+            if extracted_settings is not None:
+                self._refresh_tiers.update(rows=extracted_settings, sequence=sequence, tier=tier)
+                async with self._merge_lock:
+                    raw_settings = self._refresh_tiers.rows()
+                    try:
+                        new_settings = await self._settings_merger.merge(extracted_settings=raw_settings)
+                    except Exception as exc:
+                        logger.error('Merge settings error', exc_info=True)
+                        _check_inst_initialization(self, exc)
+                    else:
+                        self._apply_settings(
+                            new_settings=new_settings,
+                            raw_settings=raw_settings,
+                            sequence=self._refresh_tiers.sequence,
+                        )
+
+    def _apply_settings(self, new_settings: SettingsType, raw_settings: t.List[Setting], sequence: int) -> None:
+        if sequence < self._applied_sequence:
+            logger.debug('Settings of an outdated refresh were skipped. sequence=%s', sequence)
+            return
+        self._applied_sequence = sequence
+        latest_snapshot = self._history.latest
+        if latest_snapshot.version > 0 and raw_settings == latest_snapshot.raw_settings:
+            # Settings are merged from the same rows, so they are the same. A new version is not created, otherwise
+            # repeated refreshes would push the last good settings out of the history.
+            return
+        snapshot = Snapshot(version=self._history.latest.version + 1, settings=new_settings, raw_settings=raw_settings)
+        self._history.add(snapshot)
+        if self._pinned_snapshot is not None:
+            logger.info('Settings are pinned, new settings were added to the history. version=%s', snapshot.version)
+            return
+        self._switch_to(snapshot)
+
+    def _switch_to(self, snapshot: Snapshot) -> None:
+        if snapshot.version == self._version:
+            return
+        previous_settings, self._settings = self._settings, snapshot.settings
+        self._raw_settings = snapshot.raw_settings
+        self._version = snapshot.version
+        self._notify_subscribers(previous_settings=previous_settings)
+
+    def _notify_subscribers(self, previous_settings: SettingsType) -> None:
+        for setting_name, callbacks in self._subscribers.items():
+            previous_value = get_by_path(previous_settings, setting_name, default=MISSING)
+            value = get_by_path(self._settings, setting_name, default=MISSING)
+            if value is MISSING or value is previous_value or value == previous_value:
+                continue
+            for callback in callbacks:
+                try:
+                    callback(value)
+                except Exception:
+                    logger.error('Setting change callback failed. name=%s', setting_name, exc_info=True)
+
+    def subscribe(self, setting_name: str, callback: t.Callable[[t.Any], None]) -> None:
+        """
+        Registers a callback that is called with the new value of the setting each time a refresh changes it.
+        :param setting_name: name of the setting in the "key__inner_key" notation.
+        :param callback: function that receives the new value.
+        """
+        self._subscribers.setdefault(setting_name, []).append(callback)
+
+    def unsubscribe(self, setting_name: str, callback: t.Callable[[t.Any], None]) -> None:
+        callbacks = self._subscribers.get(setting_name, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+        if not callbacks:
+            self._subscribers.pop(setting_name, None)
+
+    async def profile_refresh(self, interval: float = 0.001) -> t.Dict[str, int]:
+        """
+        Refreshes settings under the sampling profiler.
+        :param interval: interval between samples in seconds.
+        :return: number of samples for each stack in the collapsed stack format, which is understood by flame graph
+        tools.
+        """
+        with SamplingProfiler(interval=interval) as profiler:
+            await self.refresh()
+        return dict(profiler.stacks)
+
     def get(self, setting_name: str, default: t.Any = None) -> t.Any:
         return self._settings.get(setting_name, default)
 
+    def memory_report(self) -> t.Dict[str, int]:
+        """
+        Measures the memory used by the current settings.
+        :return: deep size in bytes of each top-level setting. Objects shared by several settings are counted only
+        for the first of them.
+        """
+        seen: t.Set[int] = set()
+        return {key: deep_sizeof(value, seen) for key, value in self._settings.items()}
+
+    def get_setting(self, setting_name: str, default: t.Any = MISSING) -> t.Any:
+        """
+        Returns the value of the setting by its name in the "key__inner_key" notation.
+        :raise KeyError: if the setting does not exist and the default value is not passed.
+        """
+        value = get_by_path(self._settings, setting_name, default=default)
+        if value is MISSING:
+            raise KeyError(setting_name)
+        return value
+
     async def close(self) -> None:
+        self._closed = True
         self._periodic_refresh_task.cancel()
+        for periodic_tier_refresh_task in self._periodic_tier_refresh_tasks:
+            periodic_tier_refresh_task.cancel()
+        pending_tasks = list(self._requested_refresh_tasks)
+        if self._refresh_task is not None:
+            pending_tasks.append(self._refresh_task)
+        pending_tasks.extend(self._tier_refresh_tasks.values())
+        for task in pending_tasks:
+            task.cancel()
+        await asyncio.gather(*pending_tasks, return_exceptions=True)
         await self._source.close()
-        _instance.pop('inst')
+        if _instance.get('inst') is self:
+            _instance.pop('inst')
 
     def __getitem__(self, key: str) -> t.Any:
         return self._settings[key]
@@ -139,22 +479,119 @@ def get_instance() -> RuntimeConfig:
 
 
 class SettingsMerger:
-    def __init__(self, init_settings: SettingsType):
+    def __init__(
+        self,
+        init_settings: SettingsType,
+        schema: SettingsSchema | None = None,
+        tracer: BaseTracer = NOOP_TRACER,
+        derived_settings: DerivedSettingsGraph | None = None,
+        prefixes: t.Iterable[str] | None = None,
+        intern_values: bool = False,
+        executor: Executor | None = None,
+        chunk_size: int | None = None,
+    ):
+        check_thread_executor(executor)
         self.init_settings = init_settings
+        self._executor = executor
+        self._chunk_size = chunk_size
+        self._sync_merge_lock = threading.Lock()
+        self._interner = ValueInterner() if intern_values else None
+        self._previous_settings: SettingsType = {}
+        self._prefix_filter = PrefixFilter(prefixes) if prefixes else None
+        self._schema = schema
+        self._tracer = tracer
+        self._derived_settings = derived_settings
+        # Values that have passed validation, keyed by setting name. They are reused while the raw value received
+        # from the source stays the same, so only changed settings are validated again.
+        self._validated_values: t.Dict[str, t.Tuple[str, SettingValueType, t.Any]] = {}
 
     async def merge(self, extracted_settings: t.List[Setting]) -> SettingsType:
-        new_settings = copy.deepcopy(self.init_settings)
-
-        for setting in extracted_settings:
-            if setting.disable:
-                continue
-            self._insert_new_value(new_settings=new_settings, setting=setting)
-
-        return new_settings
+        """
+        Merges settings received from the source with the default settings. If an executor is set, the merge is run in
+        it. Otherwise, if a chunk size is set, the merge gives control back to the event loop after each chunk of
+        settings.
+        """
+        if self._executor is not None:
+            return await run_in_executor(self._executor, self.merge_sync, extracted_settings)
 
-    def _insert_new_value(self, new_settings: SettingsType, setting: Setting) -> None:
+        steps = self._merge(extracted_settings=extracted_settings, chunk_size=self._chunk_size)
+        try:
+            while True:
+                try:
+                    next(steps)
+                except StopIteration as exc:
+                    return t.cast(SettingsType, exc.value)
+                await asyncio.sleep(0)
+        finally:
+            # If the merge is cancelled, spans opened by the generator are closed in the context of the task.
+            steps.close()
+
+    def merge_sync(self, extracted_settings: t.List[Setting]) -> SettingsType:
+        # A merge running in the executor is not stopped if the refresh is cancelled, so the next merge waits for it.
+        with self._sync_merge_lock:
+            steps = self._merge(extracted_settings=extracted_settings, chunk_size=None)
+            while True:
+                try:
+                    next(steps)
+                except StopIteration as exc:
+                    return t.cast(SettingsType, exc.value)
+
+    def _merge(
+        self, extracted_settings: t.List[Setting], chunk_size: int | None
+    ) -> t.Generator[None, None, SettingsType]:
+        with self._tracer.start_span('runtime_config.merge', {'rows': len(extracted_settings)}):
+            with self._tracer.start_span('runtime_config.merge.copy_defaults'):
+                new_settings = copy.deepcopy(self.init_settings)
+            validated_values: t.Dict[str, t.Tuple[str, SettingValueType, t.Any]] = {}
+            nested_paths = self._get_nested_paths(extracted_settings) if self._schema is not None else set()
+
+            with self._tracer.start_span('runtime_config.merge.convert') as span:
+                for index, setting in enumerate(extracted_settings, start=1):
+                    if chunk_size and index % chunk_size == 0:
+                        yield
+                    if setting.disable:
+                        continue
+                    if self._prefix_filter is not None and not self._prefix_filter(setting.name):
+                        continue
+                    self._insert_new_value(
+                        new_settings=new_settings,
+                        setting=setting,
+                        validated_values=validated_values,
+                        nested_paths=nested_paths,
+                    )
+                if span.is_recording():
+                    span.set_attribute('bytes', sum(len(setting.value) for setting in extracted_settings))
+
+            if self._derived_settings is not None:
+                with self._tracer.start_span('runtime_config.merge.derive') as span:
+                    recomputed = self._derived_settings.apply(new_settings)
+                    span.set_attribute('recomputed', len(recomputed))
+
+            if self._interner is not None:
+                with self._tracer.start_span('runtime_config.merge.intern'):
+                    new_settings = self._interner.intern(new_settings, previous_value=self._previous_settings)
+                self._previous_settings = new_settings
+
+            self._validated_values = validated_values
+            return new_settings
+
+    def _insert_new_value(
+        self,
+        new_settings: SettingsType,
+        setting: Setting,
+        validated_values: t.Dict[str, t.Tuple[str, SettingValueType, t.Any]],
+        nested_paths: t.Set[str],
+    ) -> None:
         try:
-            new_value = converters_map[setting.value_type](setting.value)
+            new_value = self._convert(setting=setting, validated_values=validated_values, nested_paths=nested_paths)
+        except ValidationError:
+            logger.warning(
+                "Setting does not match the schema. name=%s, value_type=%s",
+                setting.name,
+                setting.value_type,
+                exc_info=True,
+            )
+            return
         except Exception:
             logger.warning(
                 "Failed to convert setting to required type. name=%s, value_type=%s",
@@ -171,6 +608,43 @@ class SettingsMerger:
         else:
             target_dict[key] = new_value
 
+    def _convert(
+        self,
+        setting: Setting,
+        validated_values: t.Dict[str, t.Tuple[str, SettingValueType, t.Any]],
+        nested_paths: t.Set[str],
+    ) -> t.Any:
+        if self._schema is None:
+            return converters_map[setting.value_type](setting.value)
+
+        cached = self._validated_values.get(setting.name)
+        if cached is not None and cached[0] == setting.value and cached[1] is setting.value_type:
+            validated_value = cached[2]
+        else:
+            validated_value = self._schema.validate(
+                setting_name=setting.name, value=converters_map[setting.value_type](setting.value)
+            )
+
+        validated_values[setting.name] = (setting.value, setting.value_type, validated_value)
+        if setting.name in nested_paths:
+            # Other settings are inserted into the value in place, so the cached value must not get into the settings.
+            return copy.deepcopy(validated_value)
+        # Merged settings are not modified after the merge, so the cached value is shared between them.
+        return validated_value
+
+    def _get_nested_paths(self, extracted_settings: t.List[Setting]) -> t.Set[str]:
+        """
+        Returns names of settings that contain other settings or derived settings, for example "db" for "db__timeout".
+        """
+        names = [setting.name for setting in extracted_settings]
+        if self._derived_settings is not None:
+            names.extend(self._derived_settings.names)
+        nested_paths: t.Set[str] = set()
+        for name in names:
+            path = name.split(PATH_SEPARATOR)
+            nested_paths.update(PATH_SEPARATOR.join(path[:index]) for index in range(1, len(path)))
+        return nested_paths
+
     def _get_inner_dict(  # type: ignore[return]
         self, settings: SettingsType, setting_name: str
     ) -> t.Tuple[t.Dict[str, t.Any], str]:
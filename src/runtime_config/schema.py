@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import typing as t
+
+from runtime_config.exceptions import ValidationError
+from runtime_config.libs.settings_path import PATH_SEPARATOR
+
+if t.TYPE_CHECKING:  # pragma: no cover
+    import pydantic
+    import pydantic.fields
+
+Validator = t.Callable[[t.Any], t.Any]
+
+
+class SettingsSchema:
+    """
+    Typed description of settings. It is compiled once into a plan that maps the name of each setting (in the same
+    "key__inner_key" notation that is used by sources) to a validator of the already converted value.
+
+    The schema can be inferred from the default settings or built from a pydantic model.
+    """
+
+    def __init__(self, validators: t.Dict[str, Validator]) -> None:
+        self._validators = validators
+
+    @classmethod
+    def from_init_settings(cls, init_settings: t.Dict[str, t.Any]) -> SettingsSchema:
+        """
+        Creates a schema in which the type of each default value determines the type of the value that can
+        override it. Settings with the default value None accept any value.
+        """
+        validators: t.Dict[str, Validator] = {}
+        _compile_defaults(validators=validators, settings=init_settings, prefix='')
+        return cls(validators=validators)
+
+    @classmethod
+    def from_model(cls, model: t.Type[pydantic.BaseModel]) -> SettingsSchema:
+        """
+        Creates a schema from a pydantic model. Fields of nested models are available by their full path.
+        """
+        validators: t.Dict[str, Validator] = {}
+        _compile_model(validators=validators, model=model, prefix='')
+        return cls(validators=validators)
+
+    def get_validator(self, setting_name: str) -> t.Optional[Validator]:
+        return self._validators.get(setting_name)
+
+    def validate(self, setting_name: str, value: t.Any) -> t.Any:
+        validator = self._validators.get(setting_name)
+        if validator is None:
+            return value
+        return validator(value)
+
+
+def _compile_defaults(validators: t.Dict[str, Validator], settings: t.Dict[str, t.Any], prefix: str) -> None:
+    for key, default in settings.items():
+        path = f'{prefix}{key}'
+        validators[path] = _build_default_validator(path=path, default=default)
+        if isinstance(default, dict):
+            _compile_defaults(validators=validators, settings=default, prefix=f'{path}{PATH_SEPARATOR}')
+
+
+def _build_default_validator(path: str, default: t.Any) -> Validator:
+    if default is None:
+        return _accept_any
+
+    def fail(value: t.Any) -> t.NoReturn:
+        raise ValidationError(
+            f'Setting {path} must be of type {type(default).__name__}, received {type(value).__name__}'
+        )
+
+    if isinstance(default, bool):
+
+        def validate_bool(value: t.Any) -> t.Any:
+            if not isinstance(value, bool):
+                fail(value)
+            return value
+
+        return validate_bool
+
+    if isinstance(default, int):
+
+        def validate_int(value: t.Any) -> t.Any:
+            if isinstance(value, bool) or not isinstance(value, int):
+                fail(value)
+            return value
+
+        return validate_int
+
+    if isinstance(default, float):
+
+        def validate_float(value: t.Any) -> t.Any:
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                fail(value)
+            return float(value)
+
+        return validate_float
+
+    if isinstance(default, (list, tuple)):
+        sequence_type = type(default)
+
+        def validate_sequence(value: t.Any) -> t.Any:
+            if not isinstance(value, (list, tuple)):
+                fail(value)
+            return value if isinstance(value, sequence_type) else sequence_type(value)
+
+        return validate_sequence
+
+    if isinstance(default, dict):
+        children = {
+            key: _build_default_validator(f'{path}{PATH_SEPARATOR}{key}', item) for key, item in default.items()
+        }
+
+        def validate_dict(value: t.Any) -> t.Any:
+            if not isinstance(value, dict):
+                fail(value)
+            for key, validator in children.items():
+                if key in value:
+                    value[key] = validator(value[key])
+            return value
+
+        return validate_dict
+
+    default_type = type(default)
+
+    def validate_instance(value: t.Any) -> t.Any:
+        if not isinstance(value, default_type):
+            fail(value)
+        return value
+
+    return validate_instance
+
+
+def _accept_any(value: t.Any) -> t.Any:
+    return value
+
+
+def _compile_model(validators: t.Dict[str, Validator], model: t.Type[pydantic.BaseModel], prefix: str) -> None:
+    import pydantic
+    import pydantic.fields
+
+    for field in model.__fields__.values():
+        path = f'{prefix}{field.alias}'
+        validators[path] = _build_field_validator(model=model, field=field)
+        if (
+            field.shape == pydantic.fields.SHAPE_SINGLETON
+            and isinstance(field.type_, type)
+            and issubclass(field.type_, pydantic.BaseModel)
+        ):
+            _compile_model(validators=validators, model=field.type_, prefix=f'{path}{PATH_SEPARATOR}')
+
+
+def _build_field_validator(model: t.Type[pydantic.BaseModel], field: pydantic.fields.ModelField) -> Validator:
+    import pydantic
+
+    def validate_field(value: t.Any) -> t.Any:
+        validated_value, errors = field.validate(value, {}, loc=field.alias, cls=model)  # type: ignore[arg-type]
+        if errors:
+            raise ValidationError(str(pydantic.ValidationError([errors], model)))  # type: ignore[list-item]
+        if isinstance(validated_value, pydantic.BaseModel):
+            return validated_value.dict(by_alias=True)
+        return validated_value
+
+    return validate_field
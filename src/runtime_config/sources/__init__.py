@@ -1 +1,23 @@
-from .config_server import ConfigServerSrc  # noqa: F401
+from __future__ import annotations
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:  # pragma: no cover
+    import typing as t
+
+    from .config_server import ConfigServerSrc  # noqa: F401
+
+__all__ = ['ConfigServerSrc']
+
+
+def __getattr__(name: str) -> t.Any:
+    # Sources depend on heavy optional libraries, so they are imported only on first access (PEP 562).
+    if name == 'ConfigServerSrc':
+        from .config_server import ConfigServerSrc
+
+        globals()[name] = ConfigServerSrc
+        return ConfigServerSrc
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__() -> t.List[str]:
+    return sorted(list(globals()) + __all__)
@@ -1,12 +1,55 @@
+from __future__ import annotations
+
 import typing as t
 from abc import ABC
 
-from runtime_config.entities.runtime_setting_server import Setting
+from runtime_config.libs.asyncio_utils import run_in_executor
+from runtime_config.libs.settings_path import PrefixFilter
+from runtime_config.tracing import NOOP_TRACER, BaseTracer
+
+if t.TYPE_CHECKING:  # pragma: no cover
+    from concurrent.futures import Executor
+
+    from runtime_config.entities.runtime_setting_server import Setting
 
 
 class BaseSource(ABC):
+    # RuntimeConfig replaces it with its own tracer, so that sources can report spans of their stages.
+    tracer: BaseTracer = NOOP_TRACER
+
     async def get_settings(self) -> t.List[Setting]:
         raise NotImplementedError  # pragma: no cover
 
+    async def get_settings_by_prefixes(self, prefixes: t.Sequence[str]) -> t.List[Setting]:
+        """
+        Returns settings from the subtrees defined by prefixes in the "key__inner_key" notation. It is used to
+        refresh groups of settings with their own interval. Sources that can filter settings on their side should
+        override it, by default all settings are fetched and filtered on the client.
+        """
+        prefix_filter = PrefixFilter(prefixes)
+        return [setting for setting in await self.get_settings() if prefix_filter(setting.name)]
+
     async def close(self) -> None:
         raise NotImplementedError  # pragma: no cover
+
+
+class BaseSyncSource(BaseSource):
+    """
+    Base class for sources with a blocking client (a file, a database driver). Subclasses implement
+    get_settings_sync, and it is run in the executor, so that fetching and decoding settings do not block the event
+    loop. If the executor is not set, the default executor of the loop is used.
+    """
+
+    executor: t.Optional[Executor] = None
+
+    def get_settings_sync(self) -> t.List[Setting]:
+        raise NotImplementedError  # pragma: no cover
+
+    def close_sync(self) -> None:
+        pass
+
+    async def get_settings(self) -> t.List[Setting]:
+        return await run_in_executor(self.executor, self.get_settings_sync)
+
+    async def close(self) -> None:
+        await run_in_executor(self.executor, self.close_sync)
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import json
 import os.path
 import typing as t
+from concurrent.futures import Executor
 from logging import getLogger
 from types import TracebackType
 from urllib.parse import urlparse
@@ -16,8 +18,11 @@ except ImportError:  # pragma: no cover
 import pydantic
 
 from runtime_config.entities.runtime_setting_server import Setting
-from runtime_config.exceptions import ValidationError
+from runtime_config.exceptions import SourceError, ValidationError
+from runtime_config.libs.asyncio_utils import check_thread_executor, run_in_executor
+from runtime_config.libs.settings_path import PrefixFilter
 from runtime_config.sources.base import BaseSource
+from runtime_config.tracing import BaseTracer
 
 logger = getLogger(__name__)
 
@@ -25,11 +30,35 @@ logger = getLogger(__name__)
 class ConfigServerSrc(BaseSource):
     """
     Source that allows you to get settings from the runtime-config server.
+
+    If prefixes are passed, only settings from the subtrees defined by them are fetched. The prefixes are sent to the
+    server as a filter, and if the server does not support it, settings are filtered on the client before validation.
+
+    If the server returns an ETag, the next request is conditional, and settings of the previous response are reused
+    when the server answers that they have not been modified.
+
+    If an executor is passed, large responses are decoded and validated in it instead of the event loop. Only thread
+    pool executors are supported.
     """
 
-    def __init__(self, host: str, service_name: str, http_client: aiohttp.ClientSession = None) -> None:
+    def __init__(
+        self,
+        host: str,
+        service_name: str,
+        http_client: aiohttp.ClientSession = None,
+        tracer: BaseTracer | None = None,
+        prefixes: t.Optional[t.Iterable[str]] = None,
+        executor: t.Optional[Executor] = None,
+    ) -> None:
+        check_thread_executor(executor)
         self._url = self._build_url(host=host, service_name=service_name)
         self._http_client = http_client or aiohttp.ClientSession()
+        self._prefix_filter = PrefixFilter(prefixes) if prefixes else None
+        self._executor = executor
+        # ETag and settings of the last response for each set of prefixes (None if all settings were requested).
+        self._cached_responses: t.Dict[t.Optional[t.Tuple[str, ...]], t.Tuple[str, t.List[Setting]]] = {}
+        if tracer is not None:
+            self.tracer = tracer
 
     def _build_url(self, host: str, service_name: str) -> str:
         parsed_url = urlparse(host)
@@ -39,15 +68,71 @@ class ConfigServerSrc(BaseSource):
         return os.path.join(host, 'get_settings', service_name)
 
     async def get_settings(self) -> t.List[Setting]:
-        resp = await self._http_client.get(url=self._url)
+        return await self._fetch_settings(prefix_filter=self._prefix_filter)
+
+    async def get_settings_by_prefixes(self, prefixes: t.Sequence[str]) -> t.List[Setting]:
+        return await self._fetch_settings(prefix_filter=PrefixFilter(prefixes))
+
+    async def _fetch_settings(self, prefix_filter: t.Optional[PrefixFilter]) -> t.List[Setting]:
+        request_params: t.Dict[str, t.Any] = {}
+        if prefix_filter is not None:
+            request_params['params'] = [('prefix', prefix) for prefix in prefix_filter.prefixes]
+        cache_key = None if prefix_filter is None else prefix_filter.prefixes
+        cached_response = self._cached_responses.get(cache_key)
+        if cached_response is not None:
+            request_params['headers'] = {'If-None-Match': cached_response[0]}
+
+        with self.tracer.start_span('runtime_config.source.request', {'url': self._url}) as span:
+            resp = await self._http_client.get(url=self._url, **request_params)
+            if resp.status == 304 and cached_response is not None:
+                span.set_attribute('not_modified', True)
+                return list(cached_response[1])
+            if not 200 <= resp.status < 300:
+                raise SourceError(
+                    f'Server responded with an error status. url={self._url}, status={resp.status}, '
+                    f'reason={resp.reason}'
+                )
+            body = await resp.read()
+            span.set_attribute('bytes', len(body))
+
+        if self._executor is not None:
+            settings = await run_in_executor(self._executor, self._decode_settings, body, prefix_filter)
+        else:
+            settings = self._decode_settings(body=body, prefix_filter=prefix_filter)
+
+        etag = resp.headers.get('ETag')
+        if etag:
+            self._cached_responses[cache_key] = (etag, list(settings))
+        else:
+            self._cached_responses.pop(cache_key, None)
+        return settings
+
+    def _decode_settings(self, body: bytes, prefix_filter: t.Optional[PrefixFilter]) -> t.List[Setting]:
+        with self.tracer.start_span('runtime_config.source.decode', {'bytes': len(body)}):
+            rows = json.loads(body)
+            if prefix_filter is not None:
+                rows = self._filter_rows(rows=rows, prefix_filter=prefix_filter)
+
         try:
-            return [Setting(**row) for row in await resp.json()]
+            with self.tracer.start_span('runtime_config.source.validate', {'rows': len(rows)}):
+                return [Setting(**row) for row in rows]
         except pydantic.ValidationError:
             raise ValidationError(
                 'Server returned an invalid response. Check the compatibility of the server that stores the settings '
                 'with the current version of the library.'
             )
 
+    @staticmethod
+    def _filter_rows(rows: t.Any, prefix_filter: PrefixFilter) -> t.Any:
+        if not isinstance(rows, list):
+            return rows
+        # Rows of an unexpected shape are kept, so that validation reports an incompatible server.
+        return [
+            row
+            for row in rows
+            if not isinstance(row, dict) or not isinstance(row.get('name'), str) or prefix_filter(row['name'])
+        ]
+
     async def close(self) -> None:
         await self._http_client.close()
 
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import contextvars
+import importlib
+import time
+import typing as t
+from abc import ABC, abstractmethod
+from types import TracebackType
+
+AttributeValue = t.Union[str, int, float, bool]
+Attributes = t.Dict[str, AttributeValue]
+
+
+class BaseSpan(ABC):
+    def is_recording(self) -> bool:
+        return True
+
+    @abstractmethod
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        raise NotImplementedError  # pragma: no cover
+
+    def __enter__(self) -> BaseSpan:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: t.Optional[t.Type[BaseException]],
+        exc_val: t.Optional[BaseException],
+        exc_tb: t.Optional[TracebackType],
+    ) -> None:
+        pass
+
+
+class BaseTracer(ABC):
+    """
+    Hook that receives spans around the stages of a settings refresh: fetching settings from the source, decoding and
+    validating the response and merging settings.
+    """
+
+    @abstractmethod
+    def start_span(self, name: str, attributes: t.Optional[Attributes] = None) -> BaseSpan:
+        raise NotImplementedError  # pragma: no cover
+
+
+class _NoopSpan(BaseSpan):
+    def is_recording(self) -> bool:
+        return False
+
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class NoopTracer(BaseTracer):
+    """
+    Tracer that is used by default. It always returns the same span that does nothing.
+    """
+
+    def start_span(self, name: str, attributes: t.Optional[Attributes] = None) -> BaseSpan:
+        return _NOOP_SPAN
+
+
+NOOP_TRACER = NoopTracer()
+
+
+class Span(BaseSpan):
+    def __init__(
+        self,
+        name: str,
+        attributes: t.Optional[Attributes],
+        parent: t.Optional[Span],
+        on_end: t.Callable[[Span], None],
+    ) -> None:
+        self.name = name
+        self.attributes: Attributes = dict(attributes or {})
+        self.parent = parent
+        self.start_time: float = 0
+        self.end_time: float = 0
+        self.error: t.Optional[BaseException] = None
+        self._on_end = on_end
+        self._token: t.Optional[contextvars.Token[t.Optional[Span]]] = None
+
+    @property
+    def duration(self) -> float:
+        return self.end_time - self.start_time
+
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        self.attributes[key] = value
+
+    def __enter__(self) -> Span:
+        self._token = _current_span.set(self)
+        self.start_time = time.perf_counter()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: t.Optional[t.Type[BaseException]],
+        exc_val: t.Optional[BaseException],
+        exc_tb: t.Optional[TracebackType],
+    ) -> None:
+        self.end_time = time.perf_counter()
+        self.error = exc_val
+        if self._token is not None:
+            _current_span.reset(self._token)
+        self._on_end(self)
+
+
+_current_span: contextvars.ContextVar[t.Optional[Span]] = contextvars.ContextVar('runtime_config_span', default=None)
+
+
+class CallbackTracer(BaseTracer):
+    """
+    Tracer that measures the duration of each span and passes the finished span to the callback. Spans started
+    inside another span have a link to it in the parent attribute.
+    """
+
+    def __init__(self, on_span_end: t.Callable[[Span], None]) -> None:
+        self._on_span_end = on_span_end
+
+    def start_span(self, name: str, attributes: t.Optional[Attributes] = None) -> Span:
+        return Span(name=name, attributes=attributes, parent=_current_span.get(), on_end=self._on_span_end)
+
+
+class OpenTelemetryTracer(BaseTracer):
+    """
+    Adapter that sends spans to OpenTelemetry.
+    """
+
+    def __init__(self, tracer: t.Any = None) -> None:
+        try:
+            trace = importlib.import_module('opentelemetry.trace')
+        except ImportError:  # pragma: no cover
+            raise ImportError(
+                'Missing dependencies for OpenTelemetryTracer support. Please install opentelemetry-api. '
+                'Example: pip install opentelemetry-api'
+            )
+
+        self._tracer = tracer or trace.get_tracer('runtime_config')
+
+    def start_span(self, name: str, attributes: t.Optional[Attributes] = None) -> BaseSpan:
+        return _OpenTelemetrySpan(self._tracer.start_as_current_span(name, attributes=attributes))
+
+
+class _OpenTelemetrySpan(BaseSpan):
+    def __init__(self, span_context_manager: t.ContextManager[t.Any]) -> None:
+        self._span_context_manager = span_context_manager
+        self._span: t.Any = None
+
+    def is_recording(self) -> bool:
+        return self._span is not None and bool(self._span.is_recording())
+
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        if self._span is not None:
+            self._span.set_attribute(key, value)
+
+    def __enter__(self) -> _OpenTelemetrySpan:
+        self._span = self._span_context_manager.__enter__()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: t.Optional[t.Type[BaseException]],
+        exc_val: t.Optional[BaseException],
+        exc_tb: t.Optional[TracebackType],
+    ) -> None:
+        self._span_context_manager.__exit__(exc_type, exc_val, exc_tb)
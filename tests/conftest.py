@@ -0,0 +1,16 @@
+import pytest
+from pytest_mock import MockerFixture
+
+from runtime_config import sources
+
+
+@pytest.fixture(name='source_mock')
+def source_mock_fixture(mocker: MockerFixture):
+    source_mock = mocker.Mock(spec=sources.ConfigServerSrc)
+    source_mock.get_settings.return_value = []
+    return source_mock
+
+
+@pytest.fixture(name='mock_periodic_task')
+def mock_periodic_task_fixture(mocker: MockerFixture):
+    mocker.patch('runtime_config.runtime_config.periodic_task')
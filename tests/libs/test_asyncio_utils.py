@@ -1,7 +1,20 @@
+import asyncio
+import contextvars
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
 import pytest
 from pytest_mock import MockerFixture
 
-from runtime_config.libs.asyncio_utils import periodic_task
+from runtime_config.libs.asyncio_utils import (
+    LoopLagMonitor,
+    check_thread_executor,
+    periodic_task,
+    run_in_executor,
+)
+
+request_id: contextvars.ContextVar[str] = contextvars.ContextVar('request_id', default='')
 
 
 async def test_periodic_task(mocker: MockerFixture):
@@ -17,3 +30,40 @@ async def test_periodic_task(mocker: MockerFixture):
     # assert
     assert func_mock.call_count == 1
     sleep_mock.assert_called_with(callback_time)
+
+
+async def test_run_in_executor__context_copied():
+    # arrange
+    request_id.set('42')
+
+    def func(suffix):
+        return threading.get_ident(), request_id.get() + suffix
+
+    # act
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        thread_id, result = await run_in_executor(executor, func, '!')
+
+    # assert
+    assert thread_id != threading.get_ident()
+    assert result == '42!'
+
+
+def test_check_thread_executor__process_pool_executor__raise_error():
+    # act & assert
+    with pytest.raises(ValueError):
+        check_thread_executor(ProcessPoolExecutor(max_workers=1))
+
+
+async def test_loop_lag_monitor():
+    # arrange
+    monitor = LoopLagMonitor(interval=0.001)
+
+    # act
+    async with monitor:
+        await asyncio.sleep(0.01)
+        time.sleep(0.05)
+        await asyncio.sleep(0.01)
+
+    # assert
+    assert monitor.max_lag >= 0.04
+    assert monitor.total_lag >= monitor.max_lag
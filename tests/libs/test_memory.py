@@ -0,0 +1,76 @@
+import sys
+
+from runtime_config.libs.memory import ValueInterner, deep_sizeof
+
+
+def test_deep_sizeof():
+    # arrange
+    value = ['a' * 100, {'key': 'b' * 100}]
+
+    # act
+    size = deep_sizeof(value)
+
+    # assert
+    assert size == (
+        sys.getsizeof(value)
+        + sys.getsizeof(value[0])
+        + sys.getsizeof(value[1])
+        + sys.getsizeof('key')
+        + sys.getsizeof(value[1]['key'])
+    )
+
+
+def test_deep_sizeof__shared_seen__shared_objects_counted_once():
+    # arrange
+    shared = 'x' * 1000
+    seen: set = set()
+
+    # act
+    first_size = deep_sizeof([shared], seen)
+    second_size = deep_sizeof([shared], seen)
+
+    # assert
+    assert first_size == sys.getsizeof([shared]) + sys.getsizeof(shared)
+    assert second_size == sys.getsizeof([shared])
+
+
+def test_value_interner__unchanged_subtrees__previous_objects_reused():
+    # arrange
+    interner = ValueInterner()
+    previous = interner.intern({'db': {'hosts': ['a', 'b']}, 'limits': (1, 2), 'timeout': 10})
+
+    # act
+    current = interner.intern({'db': {'hosts': ['a', 'b']}, 'limits': (1, 2), 'timeout': 20}, previous_value=previous)
+
+    # assert
+    assert current == {'db': {'hosts': ['a', 'b']}, 'limits': (1, 2), 'timeout': 20}
+    assert current is not previous
+    assert current['db'] is previous['db']
+    assert current['limits'] is previous['limits']
+
+
+def test_value_interner__equal_values_of_different_types__types_are_kept():
+    # arrange
+    interner = ValueInterner()
+    previous = interner.intern({'a': 1, 'b': (1,), 'c': [True]})
+
+    # act
+    current = interner.intern({'a': 1.0, 'b': (1.0,), 'c': [1]}, previous_value=previous)
+
+    # assert
+    assert type(current['a']) is float
+    assert type(current['b'][0]) is float
+    assert type(current['c'][0]) is int
+
+
+def test_value_interner__equal_strings__one_instance():
+    # arrange
+    interner = ValueInterner()
+    first = ''.join(['long', ' value'])
+    second = ''.join(['long ', 'value'])
+
+    # act
+    result = interner.intern({'first': first, 'second': second})
+
+    # assert
+    assert result['first'] is result['second']
@@ -0,0 +1,27 @@
+import time
+
+from runtime_config.libs.profiler import SamplingProfiler
+
+
+def busy_function(duration: float) -> None:
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_sampling_profiler():
+    # act
+    with SamplingProfiler(interval=0.001) as profiler:
+        busy_function(0.05)
+
+    # assert
+    assert profiler.stacks
+    assert any('busy_function' in stack.split(';')[-1] for stack in profiler.stacks)
+
+
+def test_sampling_profiler__stop_without_start__empty_result():
+    # act
+    result = SamplingProfiler().stop()
+
+    # assert
+    assert result == {}
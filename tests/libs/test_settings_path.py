@@ -0,0 +1,55 @@
+import pytest
+
+from runtime_config.libs.settings_path import PrefixFilter, get_by_path, set_by_path
+
+
+def test_get_by_path():
+    # arrange
+    settings = {'db': {'connection': {'port': 1234}}, 'name': 'main'}
+
+    # act & assert
+    assert get_by_path(settings, 'name') == 'main'
+    assert get_by_path(settings, 'db__connection__port') == 1234
+    assert get_by_path(settings, 'db__connection__host', default=None) is None
+    assert get_by_path(settings, 'name__inner', default=None) is None
+    with pytest.raises(KeyError):
+        get_by_path(settings, 'db__timeout')
+
+
+def test_set_by_path():
+    # arrange
+    settings = {'db': {'connection': {'port': 1234}}}
+
+    # act
+    set_by_path(settings, 'db__connection__host', '127.0.0.1')
+    set_by_path(settings, 'cache__timeout', 10)
+    set_by_path(settings, 'name', 'main')
+
+    # assert
+    assert settings == {
+        'db': {'connection': {'port': 1234, 'host': '127.0.0.1'}},
+        'cache': {'timeout': 10},
+        'name': 'main',
+    }
+
+
+@pytest.mark.parametrize(
+    'setting_name, expected',
+    [
+        ['db__connection', True],
+        ['db__connection__port', True],
+        ['db', True],
+        ['db__name', False],
+        ['db__connection_pool', False],
+        ['consumer', True],
+        ['consumer__limit', True],
+        ['consumers', False],
+        ['api', False],
+    ],
+)
+def test_prefix_filter(setting_name, expected):
+    # arrange
+    prefix_filter = PrefixFilter(['db__connection', 'consumer'])
+
+    # act & assert
+    assert prefix_filter(setting_name) is expected
@@ -0,0 +1,57 @@
+import threading
+
+from runtime_config.entities.runtime_setting_server import Setting
+from runtime_config.enums.setting_value_type import SettingValueType
+from runtime_config.sources.base import BaseSource, BaseSyncSource
+
+
+class StaticSource(BaseSource):
+    def __init__(self, settings):
+        self._settings = settings
+
+    async def get_settings(self):
+        return self._settings
+
+    async def close(self):
+        pass
+
+
+class StaticSyncSource(BaseSyncSource):
+    def __init__(self, settings):
+        self._settings = settings
+        self.thread_ids = []
+
+    def get_settings_sync(self):
+        self.thread_ids.append(threading.get_ident())
+        return self._settings
+
+    def close_sync(self):
+        self.thread_ids.append(threading.get_ident())
+
+
+async def test_get_settings_by_prefixes__settings_filtered_on_client():
+    # arrange
+    consumer_setting = Setting(name='consumer__limit', value='1', value_type=SettingValueType.int, disable=False)
+    api_setting = Setting(name='api__timeout', value='1', value_type=SettingValueType.int, disable=False)
+    source = StaticSource([consumer_setting, api_setting])
+
+    # act
+    settings = await source.get_settings_by_prefixes(prefixes=['consumer'])
+
+    # assert
+    assert settings == [consumer_setting]
+
+
+async def test_sync_source__methods_run_in_executor():
+    # arrange
+    setting = Setting(name='timeout', value='1', value_type=SettingValueType.int, disable=False)
+    source = StaticSyncSource([setting])
+
+    # act
+    settings = await source.get_settings()
+    await source.close()
+
+    # assert
+    assert settings == [setting]
+    assert len(source.thread_ids) == 2
+    assert threading.get_ident() not in source.thread_ids
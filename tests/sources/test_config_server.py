@@ -1,11 +1,15 @@
+import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
 import aiohttp
 import pytest
 from pytest_mock import MockerFixture
 
 from runtime_config.entities.runtime_setting_server import Setting
 from runtime_config.enums.setting_value_type import SettingValueType
-from runtime_config.exceptions import ValidationError
+from runtime_config.exceptions import SourceError, ValidationError
 from runtime_config.sources import ConfigServerSrc
+from runtime_config.tracing import CallbackTracer
 
 
 class TestConfigServerSrc:
@@ -24,6 +28,153 @@ class TestConfigServerSrc:
         assert settings == [Setting(name='timeout', value='10', value_type=SettingValueType.int, disable=False)]
         assert client_session_mock.close.call_count == 1
 
+    async def test_get_settings__tracer_passed__spans_emitted(self, client_session_mock_factory):
+        # arrange
+        server_response = [
+            {'name': 'timeout', 'value': '10', 'value_type': 'int', 'disable': False},
+        ]
+        client_session_mock_factory(server_response)
+        finished_spans = []
+        tracer = CallbackTracer(on_span_end=finished_spans.append)
+        response_size = len(json.dumps(server_response).encode())
+
+        # act
+        async with ConfigServerSrc(host='http://127.0.0.1', service_name='name', tracer=tracer) as inst:
+            await inst.get_settings()
+
+        # assert
+        assert [(span.name, span.attributes) for span in finished_spans] == [
+            ('runtime_config.source.request', {'url': 'http://127.0.0.1/get_settings/name', 'bytes': response_size}),
+            ('runtime_config.source.decode', {'bytes': response_size}),
+            ('runtime_config.source.validate', {'rows': 1}),
+        ]
+
+    async def test_get_settings__prefixes_passed__prefixes_sent_and_settings_filtered(
+        self, client_session_mock_factory
+    ):
+        # arrange
+        server_response = [
+            {'name': 'consumer__limit', 'value': '10', 'value_type': 'int', 'disable': False},
+            {'name': 'api__timeout', 'value': '10', 'value_type': 'int', 'disable': False},
+        ]
+        client_session_mock = client_session_mock_factory(server_response)
+
+        # act
+        async with ConfigServerSrc(host='http://127.0.0.1', service_name='name', prefixes=['consumer']) as inst:
+            settings = await inst.get_settings()
+
+        # assert
+        assert settings == [
+            Setting(name='consumer__limit', value='10', value_type=SettingValueType.int, disable=False)
+        ]
+        client_session_mock.get.assert_called_with(
+            url='http://127.0.0.1/get_settings/name', params=[('prefix', 'consumer')]
+        )
+
+    async def test_get_settings_by_prefixes(self, client_session_mock_factory):
+        # arrange
+        server_response = [
+            {'name': 'consumer__limit', 'value': '10', 'value_type': 'int', 'disable': False},
+            {'name': 'api__timeout', 'value': '10', 'value_type': 'int', 'disable': False},
+        ]
+        client_session_mock = client_session_mock_factory(server_response)
+
+        # act
+        async with ConfigServerSrc(host='http://127.0.0.1', service_name='name') as inst:
+            settings = await inst.get_settings_by_prefixes(prefixes=['api'])
+
+        # assert
+        assert settings == [Setting(name='api__timeout', value='10', value_type=SettingValueType.int, disable=False)]
+        client_session_mock.get.assert_called_with(
+            url='http://127.0.0.1/get_settings/name', params=[('prefix', 'api')]
+        )
+
+    async def test_get_settings__server_returned_etag__conditional_request_reuses_settings(
+        self, mocker: MockerFixture, client_session_mock_factory
+    ):
+        # arrange
+        server_response = [
+            {'name': 'timeout', 'value': '10', 'value_type': 'int', 'disable': False},
+        ]
+        client_session_mock = client_session_mock_factory(server_response, headers={'ETag': '"v1"'})
+        inst = ConfigServerSrc(host='http://127.0.0.1', service_name='name')
+        first_settings = await inst.get_settings()
+        not_modified_resp_mock = mocker.Mock(status=304, headers={'ETag': '"v1"'})
+        client_session_mock.get.return_value = not_modified_resp_mock
+
+        # act
+        second_settings = await inst.get_settings()
+
+        # assert
+        assert second_settings == first_settings
+        assert not_modified_resp_mock.read.call_count == 0
+        client_session_mock.get.assert_called_with(
+            url='http://127.0.0.1/get_settings/name', headers={'If-None-Match': '"v1"'}
+        )
+
+    async def test_get_settings__executor_passed__response_decoded_in_executor(self, client_session_mock_factory):
+        # arrange
+        server_response = [
+            {'name': 'timeout', 'value': '10', 'value_type': 'int', 'disable': False},
+        ]
+        client_session_mock_factory(server_response)
+        finished_spans = []
+        tracer = CallbackTracer(on_span_end=finished_spans.append)
+
+        # act
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            async with ConfigServerSrc(
+                host='http://127.0.0.1', service_name='name', tracer=tracer, executor=executor
+            ) as inst:
+                with tracer.start_span('refresh') as refresh_span:
+                    settings = await inst.get_settings()
+
+        # assert
+        assert settings == [Setting(name='timeout', value='10', value_type=SettingValueType.int, disable=False)]
+        assert [span.name for span in finished_spans if span.parent is refresh_span] == [
+            'runtime_config.source.request',
+            'runtime_config.source.decode',
+            'runtime_config.source.validate',
+        ]
+
+    @pytest.mark.parametrize('status', [404, 503])
+    async def test_get_settings__server_return_error_status__raise_error(
+        self, mocker: MockerFixture, client_session_mock_factory, status
+    ):
+        # arrange
+        client_session_mock = client_session_mock_factory([])
+        error_resp_mock = mocker.Mock(status=status, reason='Error', headers={})
+        client_session_mock.get.return_value = error_resp_mock
+        inst = ConfigServerSrc(host='http://127.0.0.1', service_name='name')
+
+        # act
+        with pytest.raises(SourceError) as exc:
+            await inst.get_settings()
+
+        # assert
+        assert f'status={status}' in str(exc.value)
+        assert error_resp_mock.read.call_count == 0
+
+    async def test_init__process_pool_executor__raise_error(self, client_session_mock_factory):
+        # arrange
+        client_session_mock_factory([])
+
+        # act & assert
+        with pytest.raises(ValueError):
+            ConfigServerSrc(host='http://127.0.0.1', service_name='name', executor=ProcessPoolExecutor(max_workers=1))
+
+    @pytest.mark.parametrize('server_response', [[{'value': '10'}], [{'name': 1, 'value': '10'}]])
+    async def test_get_settings__prefixes_passed_server_return_unexpected_data__raise_error(
+        self, client_session_mock_factory, server_response
+    ):
+        # arrange
+        client_session_mock_factory(server_response)
+        inst = ConfigServerSrc(host='http://127.0.0.1', service_name='name', prefixes=['consumer'])
+
+        # act & assert
+        with pytest.raises(ValidationError):
+            await inst.get_settings()
+
     @pytest.mark.parametrize('host', ['127.0.0.1', '127.0.0.1:8000', 'qwerty', '', None])
     async def test_get_settings__send_not_valid_host__raise_error(self, host):
         # act
@@ -47,9 +198,9 @@ class TestConfigServerSrc:
 
     @pytest.fixture
     def client_session_mock_factory(self, mocker: MockerFixture):
-        def factory(response):
-            resp_mock = mocker.Mock()
-            resp_mock.json = mocker.AsyncMock(return_value=response)
+        def factory(response, headers=None):
+            resp_mock = mocker.Mock(status=200, headers=headers or {})
+            resp_mock.read = mocker.AsyncMock(return_value=json.dumps(response).encode())
             client_session_mock = mocker.patch(
                 'runtime_config.sources.config_server.aiohttp.ClientSession', spec=aiohttp.ClientSession
             )()
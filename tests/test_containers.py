@@ -0,0 +1,41 @@
+import copy
+
+from runtime_config.containers import IntSet
+
+
+class TestIntSet:
+    def test_contains(self):
+        # arrange
+        int_set = IntSet([10, 3, 7, 3])
+
+        # act & assert
+        assert 3 in int_set
+        assert 10 in int_set
+        assert 4 not in int_set
+        assert 11 not in int_set
+        assert '3' not in int_set
+        assert 3 not in IntSet()
+
+    def test_sequence_protocol(self):
+        # arrange
+        int_set = IntSet([10, 3, 7, 3])
+
+        # act & assert
+        assert len(int_set) == 3
+        assert list(int_set) == [3, 7, 10]
+        assert memoryview(int_set.items).tolist() == [3, 7, 10]
+        assert repr(int_set) == 'IntSet([3, 7, 10])'
+
+    def test_eq_and_hash(self):
+        assert IntSet([1, 2]) == IntSet([2, 1])
+        assert hash(IntSet([1, 2])) == hash(IntSet([2, 1]))
+        assert IntSet([1, 2]) != IntSet([1])
+        assert IntSet([1, 2]) != {1, 2}
+
+    def test_copy__immutable_set_is_not_copied(self):
+        # arrange
+        int_set = IntSet([1, 2])
+
+        # act & assert
+        assert copy.copy(int_set) is int_set
+        assert copy.deepcopy(int_set) is int_set
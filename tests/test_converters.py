@@ -0,0 +1,57 @@
+import array
+
+import pytest
+from pytest_mock import MockerFixture
+
+from runtime_config import converters
+from runtime_config.containers import IntSet
+
+
+@pytest.fixture(params=['numpy', 'python'])
+def parser(request, mocker: MockerFixture):
+    if request.param == 'numpy':
+        pytest.importorskip('numpy')
+        mocker.patch.object(converters, '_numpy', None)
+    else:
+        mocker.patch.object(converters, '_numpy', False)
+    return request.param
+
+
+@pytest.mark.parametrize(
+    'value, expected',
+    [
+        ['[1, 2, 3]', array.array('q', [1, 2, 3])],
+        ['1,-2', array.array('q', [1, -2])],
+        ['9223372036854775807,-9223372036854775808', array.array('q', [2**63 - 1, -(2**63)])],
+        ['[]', array.array('q')],
+        ['', array.array('q')],
+    ],
+)
+def test_convert_int_array(parser, value, expected):
+    assert converters.convert_int_array(value) == expected
+
+
+@pytest.mark.parametrize('value', ['1,x', '1.5', '1,,2', '{"key": 1}'])
+def test_convert_int_array__not_valid_value__raise_error(parser, value):
+    with pytest.raises(ValueError):
+        converters.convert_int_array(value)
+
+
+@pytest.mark.parametrize('value', ['9223372036854775808', '1, -9223372036854775809'])
+@pytest.mark.parametrize('convert', [converters.convert_int_array, converters.convert_int_set])
+def test_convert_int_array__value_out_of_range__raise_error(parser, convert, value):
+    with pytest.raises(OverflowError):
+        convert(value)
+
+
+def test_convert_float_array(parser):
+    assert converters.convert_float_array('[1.5, 2, 1e3]') == array.array('d', [1.5, 2.0, 1000.0])
+
+
+def test_convert_int_set(parser):
+    # act
+    result = converters.convert_int_set('[5, 1, 5, 3]')
+
+    # assert
+    assert result == IntSet([1, 3, 5])
+    assert result.items == array.array('q', [1, 3, 5])
@@ -0,0 +1,94 @@
+import pytest
+from pytest_mock import MockerFixture
+
+from runtime_config.derived import DerivedSetting, DerivedSettingsGraph
+
+
+class TestDerivedSettingsGraph:
+    def test_apply(self):
+        # arrange
+        graph = DerivedSettingsGraph(
+            {
+                'pool__total': DerivedSetting(
+                    func=lambda size, factor: size * factor, depends_on=['pool__size', 'factor']
+                ),
+                'pool__label': DerivedSetting(func=lambda total: f'total={total}', depends_on=['pool__total']),
+            }
+        )
+        settings = {'pool': {'size': 4}, 'factor': 2}
+
+        # act
+        recomputed = graph.apply(settings)
+
+        # assert
+        assert recomputed == ['pool__total', 'pool__label']
+        assert settings == {'pool': {'size': 4, 'total': 8, 'label': 'total=8'}, 'factor': 2}
+
+    def test_apply__inputs_not_changed__value_is_not_recomputed(self, mocker: MockerFixture):
+        # arrange
+        compile_mock = mocker.Mock(side_effect=lambda pattern: f'compiled {pattern}')
+        count_mock = mocker.Mock(side_effect=lambda limit: limit * 2)
+        graph = DerivedSettingsGraph(
+            {
+                'compiled': DerivedSetting(func=compile_mock, depends_on=['pattern']),
+                'double_limit': DerivedSetting(func=count_mock, depends_on=['limit']),
+            }
+        )
+        graph.apply({'pattern': 'a+', 'limit': 1})
+        settings = {'pattern': 'a+', 'limit': 2}
+
+        # act
+        recomputed = graph.apply(settings)
+
+        # assert
+        assert recomputed == ['double_limit']
+        assert settings == {'pattern': 'a+', 'limit': 2, 'compiled': 'compiled a+', 'double_limit': 4}
+        assert compile_mock.call_count == 1
+        assert count_mock.call_count == 2
+
+    def test_apply__func_raised_error__previous_value_kept(self):
+        # arrange
+        graph = DerivedSettingsGraph({'inverse': DerivedSetting(func=lambda value: 1 / value, depends_on=['value'])})
+        graph.apply({'value': 2})
+        settings = {'value': 0}
+
+        # act
+        recomputed = graph.apply(settings)
+
+        # assert
+        assert recomputed == []
+        assert settings == {'value': 0, 'inverse': 0.5}
+
+    def test_apply__func_raised_error_on_first_computation__setting_is_not_inserted(self):
+        # arrange
+        graph = DerivedSettingsGraph({'inverse': DerivedSetting(func=lambda value: 1 / value, depends_on=['value'])})
+        settings = {'value': 0}
+
+        # act
+        graph.apply(settings)
+
+        # assert
+        assert settings == {'value': 0}
+
+    def test_apply__dependency_is_missing__setting_is_not_inserted(self):
+        # arrange
+        graph = DerivedSettingsGraph({'double': DerivedSetting(func=lambda value: value * 2, depends_on=['value'])})
+        settings = {}
+
+        # act
+        graph.apply(settings)
+
+        # assert
+        assert settings == {}
+
+    def test_init__circular_dependency__raise_error(self):
+        # act & assert
+        with pytest.raises(ValueError) as exc:
+            DerivedSettingsGraph(
+                {
+                    'a': DerivedSetting(func=lambda b: b, depends_on=['b']),
+                    'b': DerivedSetting(func=lambda a: a, depends_on=['a']),
+                }
+            )
+
+        assert str(exc.value) == 'Derived settings have a circular dependency: a -> b -> a'
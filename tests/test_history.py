@@ -0,0 +1,43 @@
+import pytest
+
+from runtime_config.history import Snapshot, SnapshotHistory, diff_settings
+from runtime_config.libs.settings_path import MISSING
+
+
+class TestSnapshotHistory:
+    def test_add__history_is_full__oldest_snapshot_dropped(self):
+        # arrange
+        history = SnapshotHistory(size=2)
+
+        # act
+        for version in range(3):
+            history.add(Snapshot(version=version, settings={'version': version}, raw_settings=[]))
+
+        # assert
+        assert history.versions == [1, 2]
+        assert history.latest.settings == {'version': 2}
+        with pytest.raises(KeyError):
+            history.get(0)
+
+    def test_init__size_less_than_one__raise_error(self):
+        # act & assert
+        with pytest.raises(ValueError):
+            SnapshotHistory(size=0)
+
+
+def test_diff_settings():
+    # arrange
+    shared = {'hosts': ['a', 'b']}
+    old_settings = {'db': {'name': 'main', 'port': 1}, 'cluster': shared, 'timeout': 10, 'removed': True}
+    new_settings = {'db': {'name': 'replica', 'port': 1.0}, 'cluster': shared, 'timeout': 10, 'added': 'x'}
+
+    # act
+    diff = diff_settings(old_settings, new_settings)
+
+    # assert
+    assert diff == {
+        'added': (MISSING, 'x'),
+        'db__name': ('main', 'replica'),
+        'db__port': (1, 1.0),
+        'removed': (True, MISSING),
+    }
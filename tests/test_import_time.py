@@ -0,0 +1,71 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+SRC_PATH = Path(__file__).parent.parent / 'src'
+
+# Budget for the cumulative import time of "from runtime_config import RuntimeConfig" in microseconds. The import
+# took about 230 ms before the lazy imports and about 75 ms after them. The budget can be raised with the
+# RUNTIME_CONFIG_IMPORT_TIME_BUDGET environment variable on slow machines.
+IMPORT_TIME_BUDGET = int(os.environ.get('RUNTIME_CONFIG_IMPORT_TIME_BUDGET', 120_000))
+
+HEAVY_MODULES = ('aiohttp', 'pydantic')
+
+
+def measure_import_time(statement: str) -> dict:
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join([str(SRC_PATH), os.environ.get('PYTHONPATH', '')])}
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement], env=env, capture_output=True, text=True, check=True
+    )
+
+    cumulative_times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, module = line[len('import time:') :].split('|')
+        cumulative_times[module.strip()] = int(cumulative)
+    return cumulative_times
+
+
+@pytest.mark.parametrize(
+    'statement',
+    [
+        'import runtime_config',
+        'from runtime_config import RuntimeConfig, get_instance',
+        'from runtime_config.converters import converters_map',
+    ],
+)
+def test_import__heavy_dependencies_are_not_imported(statement):
+    # act
+    import_times = measure_import_time(statement)
+
+    # assert
+    imported_heavy_modules = [name for name in import_times if name.split('.')[0] in HEAVY_MODULES]
+    assert imported_heavy_modules == []
+
+
+def test_import__runtime_config_import_fits_in_budget():
+    # act
+    import_times = measure_import_time('from runtime_config import RuntimeConfig')
+
+    # assert: the package and its runtime_config module are imported one after another, and the cumulative time of
+    # the module includes the time of all its dependencies.
+    total_time = import_times['runtime_config'] + import_times['runtime_config.runtime_config']
+    assert total_time <= IMPORT_TIME_BUDGET
+
+
+def test_import__sources_are_available_lazily():
+    # act
+    import_times = measure_import_time('from runtime_config.sources import ConfigServerSrc')
+
+    # assert
+    assert 'runtime_config.sources.config_server' in import_times
+    assert 'aiohttp' in import_times
+
+
+def test_import__sources_available_as_package_attribute():
+    # act & assert: the statement fails, and the subprocess raises an error, if the attribute is missing
+    measure_import_time('import runtime_config; runtime_config.sources.ConfigServerSrc')
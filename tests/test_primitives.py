@@ -0,0 +1,239 @@
+import asyncio
+
+import pytest
+from pytest_mock import MockerFixture
+
+from runtime_config.exceptions import CircuitOpenError
+from runtime_config.primitives import (
+    CircuitBreaker,
+    CircuitState,
+    ResizableSemaphore,
+    TokenBucket,
+)
+
+
+@pytest.fixture(name='clock')
+def clock_fixture(mocker: MockerFixture):
+    clock = mocker.Mock(return_value=100.0)
+    mocker.patch('runtime_config.primitives.time.monotonic', clock)
+    return clock
+
+
+class TestTokenBucket:
+    def test_try_acquire(self, clock):
+        # arrange
+        bucket = TokenBucket(rate=2, capacity=3)
+
+        # act & assert
+        assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+        clock.return_value += 0.5
+        assert bucket.try_acquire() is True
+        assert bucket.try_acquire() is False
+        clock.return_value += 10
+        assert bucket.try_acquire(tokens=3) is True
+
+    def test_set_capacity__capacity_decreased__tokens_limited(self, clock):
+        # arrange
+        bucket = TokenBucket(rate=1, capacity=10)
+
+        # act
+        bucket.set_capacity(2)
+
+        # assert
+        assert bucket.capacity == 2
+        assert bucket.try_acquire(tokens=3) is False
+        assert bucket.try_acquire(tokens=2) is True
+
+    async def test_acquire__waits_for_tokens(self):
+        # arrange
+        bucket = TokenBucket(rate=100, capacity=1)
+        await bucket.acquire()
+
+        # act
+        async with bucket:
+            pass
+
+        # assert
+        assert bucket.try_acquire() is False
+
+    async def test_acquire__rate_is_zero__waiting_task_woken_up_after_rate_changed(self):
+        # arrange
+        bucket = TokenBucket(rate=0, capacity=1)
+        await bucket.acquire()
+        acquire = asyncio.create_task(bucket.acquire())
+        await asyncio.sleep(0.01)
+        assert not acquire.done()
+
+        # act
+        bucket.set_rate(1000)
+        await asyncio.wait_for(acquire, timeout=1)
+
+        # assert
+        assert bucket.rate == 1000
+
+
+class TestResizableSemaphore:
+    async def test_acquire_and_release(self):
+        # arrange
+        semaphore = ResizableSemaphore(limit=1)
+        await semaphore.acquire()
+        waiter = asyncio.create_task(semaphore.acquire())
+        await asyncio.sleep(0)
+
+        # act
+        assert semaphore.locked() is True
+        assert not waiter.done()
+        semaphore.release()
+        await waiter
+
+        # assert
+        assert semaphore.in_use == 1
+
+    async def test_acquire__waiting_task_cancelled_before_release__cancelled_error_raised(self):
+        # arrange
+        semaphore = ResizableSemaphore(limit=1)
+        await semaphore.acquire()
+        waiter = asyncio.create_task(semaphore.acquire())
+        await asyncio.sleep(0)
+
+        # act
+        waiter.cancel()
+        semaphore.release()
+
+        # assert
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert semaphore.in_use == 0
+        await semaphore.acquire()
+        assert semaphore.in_use == 1
+
+    async def test_set_limit__limit_increased__waiting_tasks_woken_up(self):
+        # arrange
+        semaphore = ResizableSemaphore(limit=1)
+        await semaphore.acquire()
+        waiters = [asyncio.create_task(semaphore.acquire()) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        # act
+        semaphore.set_limit(3)
+        await asyncio.gather(*waiters)
+
+        # assert
+        assert semaphore.in_use == 3
+        assert semaphore.limit == 3
+
+    async def test_set_limit__limit_decreased__new_tasks_wait_until_slots_released(self):
+        # arrange
+        semaphore = ResizableSemaphore(limit=3)
+        for _ in range(3):
+            await semaphore.acquire()
+
+        # act
+        semaphore.set_limit(1)
+        waiter = asyncio.create_task(semaphore.acquire())
+        semaphore.release()
+        semaphore.release()
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        semaphore.release()
+        await waiter
+
+        # assert
+        assert semaphore.in_use == 1
+
+    async def test_acquire__waiting_task_cancelled__slot_not_lost(self):
+        # arrange
+        semaphore = ResizableSemaphore(limit=1)
+        async with semaphore:
+            waiter = asyncio.create_task(semaphore.acquire())
+            await asyncio.sleep(0)
+
+            # act
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+
+        # assert
+        assert semaphore.in_use == 0
+        await asyncio.wait_for(semaphore.acquire(), timeout=1)
+
+    async def test_acquire__task_cancelled_after_slot_given__slot_released(self):
+        # arrange
+        semaphore = ResizableSemaphore(limit=1)
+        await semaphore.acquire()
+        waiter = asyncio.create_task(semaphore.acquire())
+        await asyncio.sleep(0)
+
+        # act
+        semaphore.release()
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+        # assert
+        assert semaphore.in_use == 0
+
+
+class TestCircuitBreaker:
+    async def test_circuit_opens_after_failures_and_recovers(self, clock):
+        # arrange
+        breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=10)
+
+        # act & assert
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                async with breaker:
+                    raise ValueError
+        assert breaker.state is CircuitState.open
+        with pytest.raises(CircuitOpenError):
+            async with breaker:
+                pass
+
+        clock.return_value += 10
+        assert breaker.state is CircuitState.half_open
+        assert breaker.allow_request() is True
+        assert breaker.allow_request() is False
+        breaker.record_success()
+        assert breaker.state is CircuitState.closed
+
+    async def test_trial_call_failed__circuit_opened_again(self, clock):
+        # arrange
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10)
+        breaker.record_failure()
+        clock.return_value += 10
+
+        # act
+        with pytest.raises(ValueError):
+            async with breaker:
+                raise ValueError
+
+        # assert
+        assert breaker.state is CircuitState.open
+
+    async def test_trial_call_cancelled__next_trial_allowed(self, clock):
+        # arrange
+        breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10)
+        breaker.record_failure()
+        clock.return_value += 10
+
+        # act
+        with pytest.raises(asyncio.CancelledError):
+            async with breaker:
+                raise asyncio.CancelledError
+
+        # assert
+        assert breaker.allow_request() is True
+
+    def test_reconfigure(self, clock):
+        # arrange
+        breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=10)
+
+        # act
+        breaker.set_failure_threshold(1)
+        breaker.set_recovery_timeout(1)
+        breaker.record_failure()
+
+        # assert
+        assert breaker.state is CircuitState.open
+        clock.return_value += 1
+        assert breaker.state is CircuitState.half_open
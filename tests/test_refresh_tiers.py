@@ -0,0 +1,76 @@
+from runtime_config.entities.runtime_setting_server import Setting
+from runtime_config.enums.setting_value_type import SettingValueType
+from runtime_config.refresh_tiers import RefreshTiers
+
+
+def make_setting(name: str, value: str) -> Setting:
+    return Setting(name=name, value=value, value_type=SettingValueType.str, disable=False)
+
+
+class TestRefreshTiers:
+    def test_init__tiers_grouped_by_interval(self):
+        # act
+        tiers = RefreshTiers({'features': 5, 'kill_switches': 0.5, 'limits': 5})
+
+        # assert
+        assert [(tier.interval, tier.prefixes) for tier in tiers.tiers] == [
+            (0.5, ('kill_switches',)),
+            (5, ('features', 'limits')),
+        ]
+
+    def test_update__all_settings__distributed_over_tiers(self):
+        # arrange
+        tiers = RefreshTiers({'kill_switches': 0.5})
+        rows = [make_setting('name', 'a'), make_setting('kill_switches__payments', 'on')]
+
+        # act
+        tiers.update(rows=rows, sequence=1)
+
+        # assert
+        assert tiers.rows() == rows
+        assert tiers.sequence == 1
+
+    def test_update__tier_settings__only_tier_replaced(self):
+        # arrange
+        tiers = RefreshTiers({'kill_switches': 0.5})
+        tiers.update(rows=[make_setting('name', 'a'), make_setting('kill_switches__payments', 'on')], sequence=1)
+
+        # act
+        tiers.update(rows=[make_setting('kill_switches__payments', 'off')], sequence=2, tier=0)
+
+        # assert
+        assert tiers.rows() == [make_setting('name', 'a'), make_setting('kill_switches__payments', 'off')]
+        assert tiers.sequence == 2
+
+    def test_update__outdated_settings__skipped(self):
+        # arrange
+        tiers = RefreshTiers({'kill_switches': 0.5})
+        tiers.update(rows=[make_setting('kill_switches__payments', 'off')], sequence=3, tier=0)
+
+        # act
+        tiers.update(rows=[make_setting('name', 'a'), make_setting('kill_switches__payments', 'on')], sequence=2)
+
+        # assert
+        assert tiers.rows() == [make_setting('kill_switches__payments', 'off'), make_setting('name', 'a')]
+
+    def test_update__setting_matches_several_tiers__belongs_to_fastest_tier(self):
+        # arrange
+        tiers = RefreshTiers({'features': 5, 'features__beta': 1})
+
+        # act
+        tiers.update(rows=[make_setting('features__beta__x', 'on')], sequence=1, tier=1)
+        tiers.update(rows=[make_setting('features__beta__x', 'off')], sequence=2, tier=0)
+
+        # assert
+        assert tiers.rows() == [make_setting('features__beta__x', 'off')]
+
+    def test_update__without_tiers(self):
+        # arrange
+        tiers = RefreshTiers()
+        rows = [make_setting('name', 'a')]
+
+        # act
+        tiers.update(rows=rows, sequence=1)
+
+        # assert
+        assert tiers.rows() is rows
@@ -0,0 +1,121 @@
+import aiohttp
+import pytest
+from pytest_mock import MockerFixture
+
+from runtime_config import RuntimeConfig
+from runtime_config.entities.runtime_setting_server import Setting
+from runtime_config.enums.setting_value_type import SettingValueType
+from runtime_config.relay import SettingsRelay
+from runtime_config.runtime_config import _instance
+from runtime_config.sources import ConfigServerSrc
+
+
+@pytest.mark.usefixtures('mock_periodic_task')
+class TestSettingsRelay:
+    async def test_get_settings__client_connected_over_unix_socket__settings_served(self, source_mock, tmp_path):
+        # arrange
+        socket_path = str(tmp_path / 'relay.sock')
+        config = await RuntimeConfig.create(init_settings={'db': {'name': 'main'}, 'timeout': 10}, source=source_mock)
+        relay = SettingsRelay(config=config, service_name='service')
+        await relay.start(path=socket_path)
+        source = ConfigServerSrc(
+            host='http://localhost',
+            service_name='service',
+            http_client=aiohttp.ClientSession(connector=aiohttp.UnixConnector(path=socket_path)),
+        )
+
+        # act
+        async with config, relay, source:
+            settings = await source.get_settings()
+
+        # assert
+        assert settings == config.raw_settings
+
+    async def test_get_settings__etag_matches__not_modified(self, source_mock, unused_tcp_port):
+        # arrange
+        config = await RuntimeConfig.create(init_settings={'db': {'name': 'main'}, 'timeout': 10}, source=source_mock)
+        relay = SettingsRelay(config=config, service_name='service')
+        await relay.start(port=unused_tcp_port)
+        url = f'http://127.0.0.1:{unused_tcp_port}/get_settings/service'
+
+        async with config, relay, aiohttp.ClientSession() as session:
+            first_resp = await session.get(url, params=[('prefix', 'db')])
+            first_body = await first_resp.read()
+
+            # act
+            second_resp = await session.get(
+                url, params=[('prefix', 'db')], headers={'If-None-Match': first_resp.headers['ETag']}
+            )
+
+        # assert
+        assert first_resp.status == 200
+        assert first_body == b'[{"name": "db__name", "value": "replica", "value_type": "str", "disable": false}]'
+        assert second_resp.status == 304
+        assert second_resp.headers['ETag'] == first_resp.headers['ETag']
+
+    async def test_get_settings__new_version__settings_serialized_again(self, source_mock, unused_tcp_port):
+        # arrange
+        config = await RuntimeConfig.create(init_settings={'db': {'name': 'main'}, 'timeout': 10}, source=source_mock)
+        relay = SettingsRelay(config=config, service_name='service')
+        await relay.start(port=unused_tcp_port)
+        url = f'http://127.0.0.1:{unused_tcp_port}/get_settings/service'
+
+        async with config, relay, aiohttp.ClientSession() as session:
+            first_resp = await session.get(url)
+            source_mock.get_settings.return_value = [
+                Setting(name='timeout', value='30', value_type=SettingValueType.int, disable=False)
+            ]
+            await config.refresh()
+
+            # act
+            second_resp = await session.get(url, headers={'If-None-Match': first_resp.headers['ETag']})
+            second_body = await second_resp.json()
+
+        # assert
+        assert second_resp.status == 200
+        assert second_body == [{'name': 'timeout', 'value': '30', 'value_type': 'int', 'disable': False}]
+
+    async def test_get_settings__unknown_service__not_found(self, source_mock, unused_tcp_port):
+        # arrange
+        config = await RuntimeConfig.create(init_settings={}, source=source_mock)
+        relay = SettingsRelay(config=config, service_name='service')
+        await relay.start(port=unused_tcp_port)
+
+        # act
+        async with config, relay, aiohttp.ClientSession() as session:
+            resp = await session.get(f'http://127.0.0.1:{unused_tcp_port}/get_settings/other')
+
+        # assert
+        assert resp.status == 404
+
+    async def test_get_settings__settings_not_received__service_unavailable(self, source_mock, unused_tcp_port):
+        # arrange
+        source_mock.get_settings.side_effect = aiohttp.ClientError
+        config = await RuntimeConfig.create(init_settings={}, source=source_mock, require_complete_init=False)
+        relay = SettingsRelay(config=config, service_name='service')
+        await relay.start(port=unused_tcp_port)
+
+        # act
+        async with config, relay, aiohttp.ClientSession() as session:
+            resp = await session.get(f'http://127.0.0.1:{unused_tcp_port}/get_settings/service')
+
+        # assert
+        assert resp.status == 503
+
+    async def test_start__port_and_path_not_passed__raise_error(self, source_mock):
+        # arrange
+        config = await RuntimeConfig.create(init_settings={}, source=source_mock)
+
+        # act & assert
+        async with config:
+            with pytest.raises(ValueError):
+                await SettingsRelay(config=config).start()
+
+
+@pytest.fixture(autouse=True)
+def relay_source_fixture(mocker: MockerFixture, source_mock):
+    mocker.patch.dict(_instance, clear=True)
+    source_mock.get_settings.return_value = [
+        Setting(name='db__name', value='replica', value_type=SettingValueType.str, disable=False),
+        Setting(name='timeout', value='20', value_type=SettingValueType.int, disable=False),
+    ]
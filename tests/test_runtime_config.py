@@ -1,15 +1,26 @@
+import array
+import asyncio
 import copy
+import json
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import aiohttp
 import pytest
 from pytest_mock import MockerFixture
 
 from runtime_config import RuntimeConfig, get_instance, sources
+from runtime_config.containers import IntSet
+from runtime_config.derived import DerivedSetting, DerivedSettingsGraph
 from runtime_config.entities.runtime_setting_server import Setting
 from runtime_config.enums.setting_value_type import SettingValueType
 from runtime_config.exceptions import InitializationError, ValidationError
-from runtime_config.runtime_config import _instance
+from runtime_config.primitives import CircuitBreaker, ResizableSemaphore, TokenBucket
+from runtime_config.runtime_config import SettingsMerger, _instance
+from runtime_config.schema import SettingsSchema
+from runtime_config.tracing import CallbackTracer
 
 
 @pytest.mark.usefixtures('mock_periodic_task')
@@ -33,7 +44,7 @@ class TestRuntimeConfig:
         inst = await RuntimeConfig.create(init_settings=init_settings, refresh_interval=refresh_interval)
 
         # assert
-        source_mock.assert_called_with(host=host, service_name=service_name)
+        source_mock.assert_called_with(host=host, service_name=service_name, prefixes=None)
         periodic_refresh_task_mock.assert_called_with(inst.refresh, callback_time=refresh_interval)
 
     async def test_context_management_protocol(self, mocker: MockerFixture, init_settings):
@@ -109,6 +120,9 @@ class TestRuntimeConfig:
             ['None', SettingValueType.null, {'some_setting': None}],
             ['[1, 2, 3]', SettingValueType.json, {'some_setting': [1, 2, 3]}],
             ['{"key": "value"}', SettingValueType.json, {'some_setting': {"key": "value"}}],
+            ['[1, 2, 3]', SettingValueType.int_array, {'some_setting': array.array('q', [1, 2, 3])}],
+            ['1.5,2', SettingValueType.float_array, {'some_setting': array.array('d', [1.5, 2.0])}],
+            ['3,1,3', SettingValueType.int_set, {'some_setting': IntSet([1, 3])}],
         ],
     )
     async def test_refresh(
@@ -372,6 +386,483 @@ class TestRuntimeConfig:
         # assert
         assert inst._settings == init_settings
 
+    async def test_refresh__setting_does_not_match_schema__invalid_settings_skipped(
+        self, mocker: MockerFixture, init_settings, source_mock
+    ):
+        # arrange
+        mocker.patch.dict(_instance, clear=True)
+
+        inst = await RuntimeConfig.create(
+            init_settings=init_settings,
+            source=source_mock,
+            schema=SettingsSchema.from_init_settings(init_settings),
+        )
+        source_mock.get_settings.return_value = [
+            Setting(name='db_connect_timeout', value='fast', value_type=SettingValueType.str, disable=False),
+            Setting(name='db_name', value='replica', value_type=SettingValueType.str, disable=False),
+        ]
+
+        # act
+        await inst.refresh()
+
+        # assert
+        assert inst._settings == {'db_name': 'replica', 'db_connect_timeout': 10}
+
+    async def test_refresh__tracer_passed__spans_for_each_stage_emitted(
+        self, mocker: MockerFixture, init_settings, source_mock
+    ):
+        # arrange
+        mocker.patch.dict(_instance, clear=True)
+        finished_spans = []
+        tracer = CallbackTracer(on_span_end=finished_spans.append)
+        source_mock.get_settings.return_value = [
+            Setting(name='db_name', value='replica', value_type=SettingValueType.str, disable=False)
+        ]
+
+        # act
+        await RuntimeConfig.create(init_settings=init_settings, source=source_mock, tracer=tracer)
+
+        # assert
+        assert source_mock.tracer is tracer
+        assert [(span.name, span.parent and span.parent.name) for span in finished_spans] == [
+            ('runtime_config.fetch', 'runtime_config.refresh'),
+            ('runtime_config.merge.copy_defaults', 'runtime_config.merge'),
+            ('runtime_config.merge.convert', 'runtime_config.merge'),
+            ('runtime_config.merge', 'runtime_config.refresh'),
+            ('runtime_config.refresh', None),
+        ]
+        assert finished_spans[0].attributes == {'rows': 1}
+        assert finished_spans[2].attributes == {'bytes': len('replica')}
+
+    async def test_memory_report(self, mocker: MockerFixture, source_mock):
+        # arrange
+        mocker.patch.dict(_instance, clear=True)
+        shared = 'x' * 1000
+        source_mock.get_settings.return_value = []
+        inst = await RuntimeConfig.create(
+            init_settings={'db': {'name': shared}, 'cache': [shared], 'timeout': 10}, source=source_mock
+        )
+        inst._settings['cache'][0] = inst._settings['db']['name']
+
+        # act
+        report = inst.memory_report()
+
+        # assert
+        assert list(report) == ['db', 'cache', 'timeout']
+        assert report['db'] > len(shared)
+        assert report['cache'] < len(shared)
+        assert report['timeout'] > 0
+
+    async def test_refresh__merge_executor_passed__settings_applied(self, mocker: MockerFixture, source_mock):
+        # arrange
+        mocker.patch.dict(_instance, clear=True)
+        source_mock.get_settings.return_value = [
+            Setting(name='db_name', value='replica', value_type=SettingValueType.str, disable=False)
+        ]
+
+        # act
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            inst = await RuntimeConfig.create(
+                init_settings={'db_name': 'main'}, source=source_mock, merge_executor=executor
+            )
+
+        # assert
+        assert inst._settings == {'db_name': 'replica'}
+        assert inst.version == 1
+
+    async def test_profile_refresh(self, mocker: MockerFixture, init_settings, source_mock):
+        # arrange
+        mocker.patch.dict(_instance, clear=True)
+        inst = await RuntimeConfig.create(init_settings=init_settings, source=source_mock)
+
+        async def slow_get_settings():
+            time.sleep(0.02)
+            return [Setting(name='db_name', value='replica', value_type=SettingValueType.str, disable=False)]
+
+        source_mock.get_settings.side_effect = slow_get_settings
+
+        # act
+        stacks = await inst.profile_refresh(interval=0.001)
+
+        # assert
+        assert inst._settings['db_name'] == 'replica'
+        assert any('slow_get_settings' in stack for stack in stacks)
+
+    async def test_refresh__concurrent_calls__single_fetch_shared_by_callers(
+        self, mocker: MockerFixture, init_settings, source_mock
+    ):
+        # arrange
+        mocker.patch.dict(_instance, clear=True)
+        inst = await RuntimeConfig.create(init_settings=init_settings, source=source_mock)
+        fetch_started = asyncio.Event()
+        release_fetch = asyncio.Event()
+
+        async def get_settings():
+            fetch_started.set()
+            await release_fetch.wait()
+            return [Setting(name='db_name', value='replica', value_type=SettingValueType.str, disable=False)]
+
+        source_mock.get_settings.reset_mock()
+        source_mock.get_settings.side_effect = get_settings
+
+        # act
+        refreshes = [asyncio.create_task(inst.refresh()) for _ in range(3)]
+        await fetch_started.wait()
+        release_fetch.set()
+        await asyncio.gather(*refreshes)
+
+        # assert
+        assert source_mock.get_settings.call_count == 1
+        assert inst._settings['db_name'] == 'replica'
+        assert inst.version == 2
+
+    async def test_request_refresh__several_requests__requests_coalesced(
+        self, mocker: MockerFixture, init_settings, source_mock
+    ):
+        # arrange
+        mocker.patch.dict(_instance, clear=True)
+        inst = await RuntimeConfig.create(init_settings=init_settings, source=source_mock, refresh_debounce=0.01)
+        source_mock.get_settings.reset_mock()
+
+        # act
+        for _ in range(3):
+            inst.request_refresh()
+        await inst._refresh_request
+
+        # assert
+        assert source_mock.get_settings.call_count == 1
+
+    async def test_request_refresh__refresh_is_running__another_refresh_started_after_it(
+        self, mocker: MockerFixture, init_settings, source_mock
+    ):
+        # arrange
+        mocker.patch.dict(_instance, clear=True)
+        inst = await RuntimeConfig.create(init_settings=init_settings, source=source_mock, refresh_debounce=0)
+        release_fetch = asyncio.Event()
+        values = iter(['stale', 'fresh'])
+
+        async def get_settings():
+            value = next(values)
+            if value == 'stale':
+                await release_fetch.wait()
+            return [Setting(name='db_name', value=value, value_type=SettingValueType.str, disable=False)]
+
+        source_mock.get_settings.side_effect = get_settings
+        running_refresh = asyncio.create_task(inst.refresh())
+        await asyncio.sleep(0)
+
+        # act
+        inst.request_refresh()
+        requested_refresh = inst._refresh_request
+        await asyncio.sleep(0.01)
+        release_fetch.set()
+        await asyncio.gather(running_refresh, requested_refresh)
+
+        # assert
+        assert inst._settings['db_name'] == 'fresh'
+
+    async def test_refresh__result_of_outdated_refresh__skipped(
+        self, mocker: MockerFixture, init_settings, source_mock
+    ):
+        # arrange
+        mocker.patch.dict(_instance, clear=True)
+        inst = await RuntimeConfig.create(init_settings=init_settings, source=source_mock)
+        version = inst.version
+
+        # act
+        new_rows = [Setting(name='db_name', value='new', value_type=SettingValueType.str, disable=False)]
+        old_rows = [Setting(name='db_name', value='old', value_type=SettingValueType.str, disable=False)]
+        inst._apply_settings(new_settings={'db_name': 'new'}, raw_settings=new_rows, sequence=3)
+        inst._apply_settings(new_settings={'db_name': 'old'}, raw_settings=old_rows, sequence=2)
+
+        # assert
+        assert inst._settings == {'db_name': 'new'}
+        assert inst.version == version + 1
+
+    async def test_pin__new_settings_received__pinned_settings_kept(
+        self, mocker: MockerFixture, init_settings, source_mock
+    ):
+        # arrange
+        mocker.patch.dict(_instance, clear=True)
+        source_mock.get_settings.return_value = [
+            Setting(name='db_name', value='replica', value_type=SettingValueType.str, disable=False)
+        ]
+        inst = await RuntimeConfig.create(init_settings=init_settings, source=source_mock)
+        callback = mocker.Mock()
+        inst.subscribe('db_name', callback)
+        source_mock.get_settings.return_value = [
+            Setting(name='db_name', value='broken', value_type=SettingValueType.str, disable=False)
+        ]
+
+        # act
+        inst.pin(1)
+        await inst.refresh()
+        pinned_settings = dict(inst._settings)
+        inst.unpin()
+
+        # assert
+        assert pinned_settings['db_name'] == 'replica'
+        assert inst._settings['db_name'] == 'broken'
+        assert inst.history == [0, 1, 2]
+        assert inst.version == 2
+        assert inst.pinned_version is None
+        callback.assert_called_once_with('broken')
+
+    async def test_rollback(self, mocker: MockerFixture, init_settings, source_mock):
+        # arrange
+        mocker.patch.dict(_instance, clear=True)
+        inst = await RuntimeConfig.create(init_settings=init_settings, source=source_mock)
+        source_mock.get_settings.return_value = [
+            Setting(name='db_connect_timeout', value='30', value_type=SettingValueType.int, disable=False)
+        ]
+        await inst.refresh()
+
+        # act
+        version = inst.rollback()
+
+        # assert
+        assert version == 1
+        assert inst.pinned_version == 1
+        assert inst._settings == init_settings
+        assert inst.diff(1, 2) == {'db_connect_timeout': (10, 30)}
+        with pytest.raises(ValueError):
+            inst.rollback(steps=2)
+
+    async def test_rollback__bad_push_followed_by_unchanged_refresh__good_settings_restored(
+        self, mocker: MockerFixture, source_mock
+    ):
+        # arrange
+        mocker.patch.dict(_instance, clear=True)
+        source_mock.get_settings.return_value = [
+            Setting(name='limit', value='10', value_type=SettingValueType.int, disable=False)
+        ]
+        inst = await RuntimeConfig.create(init_settings={'limit': 1}, source=source_mock)
+        await inst.refresh()
+        source_mock.get_settings.return_value = [
+            Setting(name='limit', value='0', value_type=SettingValueType.int, disable=False)
+        ]
+        await inst.refresh()
+        await inst.refresh()
+
+        # act
+        version = inst.rollback()
+
+        # assert
+        assert inst.history == [0, 1, 2]
+        assert version == 1
+        assert inst._settings == {'limit': 10}
+
+    async def test_pin__version_not_in_history__raise_error(self, mocker: MockerFixture, init_settings, source_mock):
+        # arrange
+        mocker.patch.dict(_instance, clear=True)
+        inst = await RuntimeConfig.create(init_settings=init_settings, source=source_mock, history_size=1)
+
+        # act & assert
+        with pytest.raises(KeyError):
+            inst.pin(0)
+        assert inst.pinned_version is None
+
+    async def test_close__requested_refresh_waits_for_running_refresh__no_fetch_after_close(
+        self, mocker: MockerFixture, init_settings, source_mock
+    ):
+        # arrange
+        mocker.patch.dict(_instance, clear=True)
+        inst = await RuntimeConfig.create(init_settings=init_settings, source=source_mock, refresh_debounce=0.01)
+        source_mock.get_settings.reset_mock()
+        source_mock.get_settings.side_effect = asyncio.Event().wait
+        refresh = asyncio.create_task(inst.refresh())
+        await asyncio.sleep(0)
+        inst.request_refresh()
+        await asyncio.sleep(0.05)
+
+        # act
+        await inst.close()
+        await asyncio.sleep(0.05)
+
+        # assert
+        assert source_mock.get_settings.call_count == 1
+        assert refresh.cancelled()
+
+    async def test_close__refresh_is_running__refresh_cancelled(
+        self, mocker: MockerFixture, init_settings, source_mock
+    ):
+        # arrange
+        mocker.patch.dict(_instance, clear=True)
+        inst = await RuntimeConfig.create(init_settings=init_settings, source=source_mock)
+        source_mock.get_settings.side_effect = asyncio.Event().wait
+        refresh = asyncio.create_task(inst.refresh())
+        inst.request_refresh()
+        await asyncio.sleep(0)
+
+        # act
+        await inst.close()
+
+        # assert
+        with pytest.raises(asyncio.CancelledError):
+            await refresh
+        assert inst._refresh_task.cancelled()
+        assert source_mock.close.call_count == 1
+
+    async def test_refresh__derived_settings__recomputed_only_when_dependencies_changed(
+        self, mocker: MockerFixture, init_settings, source_mock
+    ):
+        # arrange
+        mocker.patch.dict(_instance, clear=True)
+        func_mock = mocker.Mock(side_effect=lambda timeout: timeout * 1000)
+        derived_settings = {'db_connect_timeout_ms': DerivedSetting(func=func_mock, depends_on=['db_connect_timeout'])}
+        inst = await RuntimeConfig.create(
+            init_settings=init_settings, source=source_mock, derived_settings=derived_settings
+        )
+        assert inst.db_connect_timeout_ms == 10_000
+
+        # act
+        source_mock.get_settings.return_value = [
+            Setting(name='db_name', value='replica', value_type=SettingValueType.str, disable=False)
+        ]
+        await inst.refresh()
+        source_mock.get_settings.return_value = [
+            Setting(name='db_connect_timeout', value='20', value_type=SettingValueType.int, disable=False)
+        ]
+        await inst.refresh()
+
+        # assert
+        assert inst.db_connect_timeout_ms == 20_000
+        assert func_mock.call_count == 2
+
+    async def test_subscribe__setting_changed__callback_called(self, mocker: MockerFixture, source_mock):
+        # arrange
+        mocker.patch.dict(_instance, clear=True)
+        inst = await RuntimeConfig.create(init_settings={'consumer': {'limit': 1}, 'name': 'a'}, source=source_mock)
+        limit_callback = mocker.Mock()
+        name_callback = mocker.Mock(side_effect=Exception)
+        unsubscribed_callback = mocker.Mock()
+        inst.subscribe('consumer__limit', limit_callback)
+        inst.subscribe('name', name_callback)
+        inst.subscribe('name', unsubscribed_callback)
+        inst.unsubscribe('name', unsubscribed_callback)
+        inst.unsubscribe('name', unsubscribed_callback)
+
+        # act
+        source_mock.get_settings.return_value = [
+            Setting(name='consumer__limit', value='5', value_type=SettingValueType.int, disable=False),
+            Setting(name='name', value='b', value_type=SettingValueType.str, disable=False),
+        ]
+        await inst.refresh()
+        await inst.refresh()
+
+        # assert
+        limit_callback.assert_called_once_with(5)
+        name_callback.assert_called_once_with('b')
+        assert unsubscribed_callback.call_count == 0
+
+    async def test_get_setting(self, mocker: MockerFixture, source_mock):
+        # arrange
+        mocker.patch.dict(_instance, clear=True)
+
+        # act
+        inst = await RuntimeConfig.create(init_settings={'db': {'port': 1234}}, source=source_mock)
+
+        # assert
+        assert inst.get_setting('db__port') == 1234
+        assert inst.get_setting('db__host', default=None) is None
+        with pytest.raises(KeyError):
+            inst.get_setting('db__host')
+
+    async def test_primitives_bound_to_settings__resized_after_refresh(self, mocker: MockerFixture, source_mock):
+        # arrange
+        mocker.patch.dict(_instance, clear=True)
+        inst = await RuntimeConfig.create(
+            init_settings={'consumer': {'rate': 10, 'burst': 5, 'concurrency': 2, 'failures': 3, 'recovery': 1}},
+            source=source_mock,
+        )
+        bucket = TokenBucket.from_settings(inst, rate='consumer__rate', capacity='consumer__burst')
+        semaphore = ResizableSemaphore.from_settings(inst, limit='consumer__concurrency')
+        breaker = CircuitBreaker.from_settings(
+            inst, failure_threshold='consumer__failures', recovery_timeout='consumer__recovery'
+        )
+        source_mock.get_settings.return_value = [
+            Setting(name='consumer__rate', value='100', value_type=SettingValueType.int, disable=False),
+            Setting(name='consumer__concurrency', value='8', value_type=SettingValueType.int, disable=False),
+            Setting(name='consumer__failures', value='1', value_type=SettingValueType.int, disable=False),
+        ]
+
+        # act
+        await inst.refresh()
+
+        # assert
+        assert (bucket.rate, bucket.capacity) == (100, 5)
+        assert semaphore.limit == 8
+        breaker.record_failure()
+        assert breaker.allow_request() is False
+
+    async def test_refresh__prefixes_passed__settings_outside_prefixes_skipped(
+        self, mocker: MockerFixture, init_settings, source_mock
+    ):
+        # arrange
+        mocker.patch.dict(_instance, clear=True)
+        convert_mock = mocker.patch.dict(
+            'runtime_config.runtime_config.converters_map', {SettingValueType.str: mocker.Mock(side_effect=str)}
+        )
+        source_mock.get_settings.return_value = [
+            Setting(name='db_name', value='replica', value_type=SettingValueType.str, disable=False),
+            Setting(name='api__name', value='api', value_type=SettingValueType.str, disable=False),
+        ]
+
+        # act
+        inst = await RuntimeConfig.create(init_settings=init_settings, source=source_mock, prefixes=['db_name'])
+
+        # assert
+        assert inst._settings == {'db_name': 'replica', 'db_connect_timeout': 10}
+        convert_mock[SettingValueType.str].assert_called_once_with('replica')
+
+    async def test_refresh_tiers__hot_settings_refreshed_with_own_interval(
+        self, mocker: MockerFixture, init_settings, source_mock
+    ):
+        # arrange
+        mocker.patch.dict(_instance, clear=True)
+        periodic_task_mock = mocker.patch('runtime_config.runtime_config.periodic_task')
+        source_mock.get_settings.return_value = [
+            Setting(name='db_name', value='replica', value_type=SettingValueType.str, disable=False),
+            Setting(name='kill_switches__payments', value='false', value_type=SettingValueType.bool, disable=False),
+        ]
+        inst = await RuntimeConfig.create(
+            init_settings=init_settings, source=source_mock, refresh_interval=60, refresh_tiers={'kill_switches': 0.5}
+        )
+        source_mock.get_settings_by_prefixes.return_value = [
+            Setting(name='kill_switches__payments', value='true', value_type=SettingValueType.bool, disable=False),
+        ]
+        tier_refresh = periodic_task_mock.call_args_list[0].args[0]
+
+        # act
+        await tier_refresh()
+
+        # assert
+        assert [call.kwargs['callback_time'] for call in periodic_task_mock.call_args_list] == [0.5, 60]
+        source_mock.get_settings_by_prefixes.assert_called_once_with(prefixes=('kill_switches',))
+        assert inst._settings == {
+            'db_name': 'replica',
+            'db_connect_timeout': 10,
+            'kill_switches': {'payments': True},
+        }
+
+    async def test_refresh_tiers__tier_fetch_failed_during_initialization__error_not_raised(
+        self, mocker: MockerFixture, init_settings, source_mock
+    ):
+        # arrange
+        periodic_task_mock = mocker.patch('runtime_config.runtime_config.periodic_task')
+        inst = RuntimeConfig(
+            init_settings=init_settings, source=source_mock, refresh_interval=60, refresh_tiers={'kill_switches': 0.1}
+        )
+        source_mock.get_settings_by_prefixes.side_effect = aiohttp.ClientError
+        tier_refresh = periodic_task_mock.call_args_list[0].args[0]
+
+        # act
+        await tier_refresh()
+
+        # assert
+        assert source_mock.get_settings_by_prefixes.call_count == 1
+        assert inst._settings == init_settings
+
     async def test_get(self, mocker: MockerFixture, source_mock):
         # arrange
         mocker.patch.dict(_instance, clear=True)
@@ -486,21 +977,184 @@ async def test_get_instance__runed_before_create_instance__raise_exception(
     )
 
 
+class TestSettingsMerger:
+    async def test_merge__raw_value_not_changed__value_is_not_validated_again(self, mocker: MockerFixture):
+        # arrange
+        init_settings = {'downloader': {'credentials': {'login': 'dima'}}, 'timeout': 10}
+        schema = SettingsSchema.from_init_settings(init_settings)
+        validate_spy = mocker.spy(schema, 'validate')
+        merger = SettingsMerger(init_settings=init_settings, schema=schema)
+        extracted_settings = [
+            Setting(
+                name='downloader__credentials',
+                value='{"login": "alex"}',
+                value_type=SettingValueType.json,
+                disable=False,
+            ),
+            Setting(name='timeout', value='20', value_type=SettingValueType.int, disable=False),
+        ]
+
+        # act
+        first_settings = await merger.merge(extracted_settings=extracted_settings)
+        extracted_settings[1] = Setting(name='timeout', value='30', value_type=SettingValueType.int, disable=False)
+        second_settings = await merger.merge(extracted_settings=extracted_settings)
+
+        # assert
+        assert first_settings == {'downloader': {'credentials': {'login': 'alex'}}, 'timeout': 20}
+        assert second_settings == {'downloader': {'credentials': {'login': 'alex'}}, 'timeout': 30}
+        assert first_settings['downloader']['credentials'] is second_settings['downloader']['credentials']
+        assert [call.kwargs['setting_name'] for call in validate_spy.call_args_list] == [
+            'downloader__credentials',
+            'timeout',
+            'timeout',
+        ]
+
+    async def test_merge__raw_value_not_changed__value_is_not_converted_or_copied(self, mocker: MockerFixture):
+        # arrange
+        init_settings = {'rules': [], 'timeout': 10}
+        merger = SettingsMerger(init_settings=init_settings, schema=SettingsSchema.from_init_settings(init_settings))
+        extracted_settings = [
+            Setting(
+                name='rules', value=json.dumps(list(range(1000))), value_type=SettingValueType.json, disable=False
+            ),
+            Setting(name='timeout', value='20', value_type=SettingValueType.int, disable=False),
+        ]
+        first_settings = await merger.merge(extracted_settings=extracted_settings)
+        json_loads_spy = mocker.spy(json, 'loads')
+        deepcopy_spy = mocker.spy(copy, 'deepcopy')
+
+        # act
+        second_settings = await merger.merge(extracted_settings=extracted_settings)
+
+        # assert
+        assert second_settings['rules'] is first_settings['rules']
+        assert json_loads_spy.call_count == 0
+        assert [call.args[0] for call in deepcopy_spy.call_args_list] == [init_settings]
+
+    async def test_merge__setting_inserted_into_cached_value__cached_value_not_modified(self):
+        # arrange
+        init_settings = {'db': {'host': 'localhost'}}
+        merger = SettingsMerger(init_settings=init_settings, schema=SettingsSchema.from_init_settings(init_settings))
+        extracted_settings = [
+            Setting(name='db', value='{"host": "main"}', value_type=SettingValueType.json, disable=False),
+            Setting(name='db__port', value='5432', value_type=SettingValueType.int, disable=False),
+        ]
+        await merger.merge(extracted_settings=extracted_settings)
+
+        # act
+        settings = await merger.merge(extracted_settings=extracted_settings[:1])
+
+        # assert
+        assert settings == {'db': {'host': 'main'}}
+
+    async def test_merge__executor_passed__merged_in_executor(self, mocker: MockerFixture):
+        # arrange
+        merger_thread_ids = []
+        derived_setting = DerivedSetting(
+            func=lambda timeout: merger_thread_ids.append(threading.get_ident()) or timeout * 2,
+            depends_on=['timeout'],
+        )
+        extracted_settings = [Setting(name='timeout', value='20', value_type=SettingValueType.int, disable=False)]
+
+        # act
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            merger = SettingsMerger(
+                init_settings={'timeout': 10},
+                derived_settings=DerivedSettingsGraph({'double_timeout': derived_setting}),
+                executor=executor,
+            )
+            settings = await merger.merge(extracted_settings=extracted_settings)
+
+        # assert
+        assert settings == {'timeout': 20, 'double_timeout': 40}
+        assert len(merger_thread_ids) == 1
+        assert merger_thread_ids[0] != threading.get_ident()
+
+    async def test_merge__chunk_size_passed__event_loop_not_blocked(self):
+        # arrange
+        merger = SettingsMerger(init_settings={}, chunk_size=2)
+        extracted_settings = [
+            Setting(name=f'setting_{index}', value=str(index), value_type=SettingValueType.int, disable=False)
+            for index in range(6)
+        ]
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        ticker = asyncio.create_task(tick())
+        await asyncio.sleep(0)
+        ticks = 0
+
+        # act
+        settings = await merger.merge(extracted_settings=extracted_settings)
+        ticker.cancel()
+
+        # assert
+        assert settings == {f'setting_{index}': index for index in range(6)}
+        assert ticks == 3
+
+    async def test_merge__chunked_merge_cancelled__spans_closed(self):
+        # arrange
+        finished_spans = []
+        merger = SettingsMerger(
+            init_settings={}, tracer=CallbackTracer(on_span_end=finished_spans.append), chunk_size=1
+        )
+        extracted_settings = [
+            Setting(name=f'setting_{index}', value=str(index), value_type=SettingValueType.int, disable=False)
+            for index in range(10)
+        ]
+        merge = asyncio.create_task(merger.merge(extracted_settings=extracted_settings))
+        await asyncio.sleep(0)
+
+        # act
+        merge.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await merge
+
+        # assert
+        assert [span.name for span in finished_spans] == [
+            'runtime_config.merge.copy_defaults',
+            'runtime_config.merge.convert',
+            'runtime_config.merge',
+        ]
+        assert isinstance(finished_spans[-1].error, GeneratorExit)
+
+    async def test_merge__intern_values__unchanged_settings_reuse_previous_objects(self):
+        # arrange
+        init_settings = {'downloader': {'credentials': {'login': 'dima'}}, 'timeout': 10}
+        merger = SettingsMerger(init_settings=init_settings, intern_values=True)
+        extracted_settings = [
+            Setting(
+                name='downloader__credentials',
+                value='{"login": "alex", "hosts": ["a", "b"]}',
+                value_type=SettingValueType.json,
+                disable=False,
+            ),
+            Setting(name='timeout', value='20', value_type=SettingValueType.int, disable=False),
+        ]
+
+        # act
+        first_settings = await merger.merge(extracted_settings=extracted_settings)
+        extracted_settings[1] = Setting(name='timeout', value='30', value_type=SettingValueType.int, disable=False)
+        second_settings = await merger.merge(extracted_settings=extracted_settings)
+        third_settings = await merger.merge(extracted_settings=extracted_settings)
+
+        # assert
+        assert second_settings == {
+            'downloader': {'credentials': {'login': 'alex', 'hosts': ['a', 'b']}},
+            'timeout': 30,
+        }
+        assert second_settings['downloader'] is first_settings['downloader']
+        assert third_settings is second_settings
+
+
 @pytest.fixture(name='init_settings')
 def init_settings_fixture():
     return {
         "db_name": 'main',
         "db_connect_timeout": 10,
     }
-
-
-@pytest.fixture(name='source_mock')
-def source_mock_fixture(mocker: MockerFixture):
-    source_mock = mocker.Mock(spec=sources.ConfigServerSrc)
-    source_mock.get_settings.return_value = []
-    return source_mock
-
-
-@pytest.fixture(name='mock_periodic_task')
-def mock_periodic_task_fixture(mocker: MockerFixture):
-    mocker.patch('runtime_config.runtime_config.periodic_task')
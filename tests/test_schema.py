@@ -0,0 +1,115 @@
+import pydantic
+import pytest
+
+from runtime_config.exceptions import ValidationError
+from runtime_config.schema import SettingsSchema
+
+
+class TestSettingsSchemaFromInitSettings:
+    @pytest.mark.parametrize(
+        'default, value, expected',
+        [
+            ['main', 'replica', 'replica'],
+            [10, 20, 20],
+            [0.5, 1, 1.0],
+            [True, False, False],
+            [None, 'anything', 'anything'],
+            [[1, 2], [3], [3]],
+            [(1, 2), [3], (3,)],
+            [{'host': 'localhost'}, {'host': '127.0.0.1'}, {'host': '127.0.0.1'}],
+        ],
+    )
+    def test_validate(self, default, value, expected):
+        # arrange
+        schema = SettingsSchema.from_init_settings({'some_setting': default})
+
+        # act
+        result = schema.validate(setting_name='some_setting', value=value)
+
+        # assert
+        assert result == expected
+        assert type(result) is type(expected)
+
+    @pytest.mark.parametrize(
+        'default, value',
+        [
+            ['main', 1],
+            [10, '20'],
+            [10, True],
+            [0.5, 'value'],
+            [True, 1],
+            [[1, 2], {'key': 'value'}],
+            [{'host': 'localhost'}, 'localhost'],
+            [{'port': 1234}, {'port': 'qwerty'}],
+        ],
+    )
+    def test_validate__value_type_mismatch__raise_error(self, default, value):
+        # arrange
+        schema = SettingsSchema.from_init_settings({'some_setting': default})
+
+        # act & assert
+        with pytest.raises(ValidationError):
+            schema.validate(setting_name='some_setting', value=value)
+
+    def test_validate__nested_setting(self):
+        # arrange
+        schema = SettingsSchema.from_init_settings({'db': {'connection': {'port': 1234}}})
+
+        # act & assert
+        assert schema.validate(setting_name='db__connection__port', value=4321) == 4321
+        with pytest.raises(ValidationError):
+            schema.validate(setting_name='db__connection__port', value='4321')
+
+    def test_validate__setting_not_in_schema__value_returned_as_is(self):
+        # arrange
+        schema = SettingsSchema.from_init_settings({'db_name': 'main'})
+
+        # act
+        result = schema.validate(setting_name='some_setting', value=1)
+
+        # assert
+        assert result == 1
+        assert schema.get_validator('some_setting') is None
+
+
+class TestSettingsSchemaFromModel:
+    def test_validate(self):
+        # arrange
+        schema = SettingsSchema.from_model(SettingsModel)
+
+        # act & assert
+        assert schema.validate(setting_name='timeout', value=5) == 5.0
+        assert schema.validate(setting_name='db__port', value='4321') == 4321
+        assert schema.validate(setting_name='db', value={'name': 'replica', 'port': 1}) == {
+            'name': 'replica',
+            'port': 1,
+        }
+        assert schema.validate(setting_name='hosts', value=['a', 'b']) == ['a', 'b']
+
+    @pytest.mark.parametrize(
+        'setting_name, value',
+        [
+            ['timeout', 'qwerty'],
+            ['db__port', 'qwerty'],
+            ['db', {'name': 'replica'}],
+            ['hosts', 'qwerty'],
+        ],
+    )
+    def test_validate__not_valid_value__raise_error(self, setting_name, value):
+        # arrange
+        schema = SettingsSchema.from_model(SettingsModel)
+
+        # act & assert
+        with pytest.raises(ValidationError):
+            schema.validate(setting_name=setting_name, value=value)
+
+
+class DbSettingsModel(pydantic.BaseModel):
+    name: str
+    port: int
+
+
+class SettingsModel(pydantic.BaseModel):
+    timeout: float = 1.0
+    db: DbSettingsModel
+    hosts: list = []
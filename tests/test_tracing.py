@@ -0,0 +1,79 @@
+import pytest
+
+from runtime_config.tracing import NOOP_TRACER, CallbackTracer, OpenTelemetryTracer
+
+
+class TestNoopTracer:
+    def test_start_span(self):
+        # act
+        with NOOP_TRACER.start_span('span', {'rows': 1}) as span:
+            span.set_attribute('bytes', 10)
+
+        # assert
+        assert span.is_recording() is False
+        assert NOOP_TRACER.start_span('other_span') is span
+
+
+class TestCallbackTracer:
+    def test_start_span__nested_spans(self):
+        # arrange
+        finished_spans = []
+        tracer = CallbackTracer(on_span_end=finished_spans.append)
+
+        # act
+        with tracer.start_span('outer', {'rows': 1}) as outer_span:
+            with tracer.start_span('inner') as inner_span:
+                inner_span.set_attribute('bytes', 10)
+
+        # assert
+        assert finished_spans == [inner_span, outer_span]
+        assert inner_span.parent is outer_span
+        assert outer_span.parent is None
+        assert outer_span.attributes == {'rows': 1}
+        assert inner_span.attributes == {'bytes': 10}
+        assert outer_span.duration >= inner_span.duration >= 0
+        assert inner_span.is_recording() is True
+
+    def test_start_span__exception_inside_span__error_recorded(self):
+        # arrange
+        finished_spans = []
+        tracer = CallbackTracer(on_span_end=finished_spans.append)
+        error = ValueError('error')
+
+        # act
+        with pytest.raises(ValueError):
+            with tracer.start_span('span'):
+                raise error
+
+        # assert
+        assert finished_spans[0].error is error
+        assert tracer.start_span('next_span').parent is None
+
+
+class TestOpenTelemetryTracer:
+    def test_start_span(self):
+        # arrange
+        pytest.importorskip('opentelemetry.sdk')
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+            InMemorySpanExporter,
+        )
+
+        exporter = InMemorySpanExporter()
+        provider = TracerProvider()
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+        tracer = OpenTelemetryTracer(tracer=provider.get_tracer('test'))
+
+        # act
+        with tracer.start_span('outer', {'rows': 1}):
+            with tracer.start_span('inner') as span:
+                span.set_attribute('bytes', 10)
+                is_recording = span.is_recording()
+
+        # assert
+        inner, outer = exporter.get_finished_spans()
+        assert is_recording is True
+        assert (outer.name, dict(outer.attributes)) == ('outer', {'rows': 1})
+        assert (inner.name, dict(inner.attributes)) == ('inner', {'bytes': 10})
+        assert inner.parent.span_id == outer.context.span_id